@@ -34,6 +34,7 @@ typedef int socklen_t;
 typedef SOCKET socket_t;
 #define INVALID_SOCKET_FD INVALID_SOCKET
 #define close_socket      closesocket
+#define SHUTDOWN_BOTH     SD_BOTH
 #elif defined(__APPLE__)
 // macOS平台专用头文件和定义
 #include <arpa/inet.h>
@@ -47,6 +48,7 @@ typedef SOCKET socket_t;
 typedef int socket_t;
 #define INVALID_SOCKET_FD -1
 #define close_socket      close
+#define SHUTDOWN_BOTH     SHUT_RDWR
 #else
 // Linux平台专用头文件和定义
 #include <arpa/inet.h>
@@ -59,6 +61,7 @@ typedef int socket_t;
 typedef int socket_t;
 #define INVALID_SOCKET_FD -1
 #define close_socket      close
+#define SHUTDOWN_BOTH     SHUT_RDWR
 #endif
 
 // SIMD指令集支持
@@ -86,6 +89,14 @@ typedef int socket_t;
 /** @brief 网络接收超时时间，单位：秒 */
 #define RECV_TIMEOUT_SEC 10
 
+/**
+ * @brief 解包缓冲区槽数（三缓冲）
+ *
+ * 接收线程轮流写各槽。最近发布的槽要再发布两帧之后才会被重写，
+ * 读取方处理完后用 get_frame_seq() 检查序号前进不足 UNPACK_SLOT_COUNT-1 即可确认数据未被覆盖。
+ */
+#define UNPACK_SLOT_COUNT 3
+
 /** @brief 解包线程的最小数据块大小，单位：字节 */
 #define MIN_CHUNK_SIZE (1024 * 1024)  // 1MB
 
@@ -115,13 +126,27 @@ struct frame_header
  */
 struct stats
 {
-    uint32_t frames_received; /**< 已接收的帧总数 */
-    uint32_t bytes_received;  /**< 已接收的字节总数 */
+    uint64_t frames_received; /**< 已接收的帧总数 */
+    uint64_t bytes_received;  /**< 已接收的字节总数（64位，高码率下不回绕） */
     uint64_t start_time;      /**< 程序开始时间，纳秒 */
     uint64_t last_frame_time; /**< 最后一帧接收时间，纳秒 */
     double avg_fps;           /**< 平均帧率，帧/秒 */
 };
 
+/**
+ * @struct snapshot
+ * @brief 供读取方一次性获取的状态快照（统计信息 + 最新解包帧）
+ */
+struct snapshot
+{
+    uint64_t frames_received; /**< 已接收的帧总数 */
+    uint64_t bytes_received;  /**< 已接收的字节总数（64位，高码率下不回绕） */
+    double avg_fps;           /**< 平均帧率，帧/秒 */
+    uint64_t frame_seq;       /**< 已发布帧的序号 */
+    const uint16_t* frame;    /**< 最近完成的解包槽，尚无完整帧时为NULL */
+    size_t frame_pixels;      /**< 解包槽容量，像素为单位 */
+};
+
 /**
  * @struct unpack_task
  * @brief 图像解包任务结构体
@@ -134,6 +159,26 @@ struct unpack_task {
     int thread_id;              /**< 线程ID */
 };
 
+/**
+ * @brief 帧就绪回调函数类型
+ *
+ * 接收线程每处理完一帧调用一次，参数为帧序号。回调在接收线程中执行，应尽快返回。
+ */
+typedef void (*frame_ready_cb_t)(uint32_t frame_id);
+
+/**
+ * @brief 逐帧数据回调函数类型
+ *
+ * 每接收完一帧（帧头+负载）调用一次，payload 指向接收缓冲区中的原始数据，
+ * 仅在回调返回前有效。回调在接收线程中执行，应尽快返回。
+ */
+typedef void (*frame_cb_t)(const struct frame_header* header, const void* payload, size_t size);
+
+// client_config.flags 位定义
+#define CONFIG_ENABLE_SAVE       (1u << 0)  /**< 启用文件保存 (未置位=仅内存) */
+#define CONFIG_ENABLE_CONVERSION (1u << 1)  /**< 启用SBGGR10转换 */
+#define CONFIG_USE_IO_URING      (1u << 2)  /**< 使用io_uring接收 (仅Linux，不可用时回退到recv) */
+
 /**
  * @struct client_config
  * @brief 客户端配置结构体
@@ -142,9 +187,10 @@ struct client_config {
     const char* server_ip;       /**< 服务器IP地址 */
     int port;                    /**< 服务器端口 */
     const char* output_dir;      /**< 输出目录 */
-    int enable_conversion;       /**< 是否启用SBGGR10转换 */
-    int save_interval;           /**< 保存间隔 */
-    int enable_save;             /**< 是否启用文件保存 (0=仅内存, 1=保存文件) */
+    uint32_t flags;              /**< 开关位组合，见 CONFIG_* */
+    uint16_t save_interval;      /**< 保存间隔 */
+    uint16_t reserved;           /**< 保留字段，置0 */
+    frame_cb_t on_frame;         /**< 逐帧数据回调，NULL表示不回调 */
 };
 
 // ========================== 全局变量声明 ==========================
@@ -154,6 +200,8 @@ extern socket_t sock_fd;
 extern struct stats stats;
 extern uint16_t* g_unpack_buffer;
 extern size_t g_buffer_size;
+extern volatile int g_ready_slot;
+extern volatile uint64_t g_frame_seq;
 
 // ========================== 函数声明 ==========================
 
@@ -168,6 +216,8 @@ int init_network(void);
 void cleanup_network(void);
 socket_t connect_to_server(const char* ip, int port);
 int recv_full(socket_t sock, void* buffer, size_t size);
+void cancel_receive(socket_t sock);
+int has_io_uring(void);
 
 // 文件系统管理函数
 int create_output_dir(const char* dir);
@@ -179,6 +229,9 @@ BOOL WINAPI console_handler(DWORD signal);
 void signal_handler(int sig);
 #endif
 
+// 数据校验函数
+uint32_t crc32_compute(const void* data, size_t size);
+
 // 图像数据处理函数
 int save_frame(const uint8_t* data, size_t size, uint32_t frame_id,
                uint32_t width, uint32_t height, uint32_t pixfmt,
@@ -203,9 +256,12 @@ int unpack_sbggr10_image(const uint8_t *raw_data, size_t raw_size,
 // 性能统计函数
 void update_stats(uint32_t frame_size);
 void print_stats(void);
+void get_snapshot(struct snapshot* out);
+uint64_t get_frame_seq(void);
 
 // 主接收循环
 int receive_loop(socket_t sock, const struct client_config* config);
+void set_frame_ready_cb(frame_ready_cb_t cb);
 
 // 命令行界面函数
 void print_usage(const char* prog_name);
@@ -214,5 +270,8 @@ int parse_arguments(int argc, char* argv[], struct client_config* config);
 // 内存管理函数
 void init_memory_pool(void);
 void cleanup_memory_pool(void);
+int pool_enable_hugepages(size_t slot_bytes);
+uint16_t* acquire_unpack_slot(void);
+void publish_unpack_slot(const uint16_t* slot);
 
 #endif // V4L2_USB_PC_H
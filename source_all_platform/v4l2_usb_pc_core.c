@@ -14,6 +14,21 @@
 #include <signal.h>
 #include <sys/stat.h>
 
+#ifdef __linux__
+#include <sys/mman.h>
+#endif
+
+#ifdef HAVE_IO_URING
+#include <linux/io_uring.h>
+#include <sys/syscall.h>
+#if !defined(__NR_io_uring_setup) || !defined(__NR_io_uring_enter) || !defined(__NR_io_uring_register)
+#undef HAVE_IO_URING
+#endif
+#endif
+
+// 帧头是线上格式，布局必须与服务端和 Python 端一致（C99 下用数组长度做编译期检查）
+typedef char frame_header_size_check[(sizeof(struct frame_header) == 40) ? 1 : -1];
+
 // ========================== 全局状态变量 ==========================
 
 /** @brief 程序运行状态标志，0表示停止，1表示运行 */
@@ -25,10 +40,19 @@ socket_t sock_fd = INVALID_SOCKET_FD;
 /** @brief 性能统计信息 */
 struct stats stats = {0};
 
-/** @brief 全局内存池 - 解包缓冲区 */
+/** @brief 全局内存池 - 解包缓冲区（UNPACK_SLOT_COUNT 个连续的槽，g_buffer_size 为每槽像素数） */
 uint16_t* g_unpack_buffer = NULL;
 size_t g_buffer_size = 0;
 
+/** @brief 最近一次解包完成的槽序号，-1 表示尚无完整帧 */
+volatile int g_ready_slot = -1;
+
+/** @brief 已发布帧的序号，每发布一个解包槽递增一次 */
+volatile uint64_t g_frame_seq = 0;
+
+/** @brief 帧就绪回调（可选），由 set_frame_ready_cb 注册 */
+static frame_ready_cb_t g_frame_ready_cb = NULL;
+
 // ========================== 跨平台工具函数 ==========================
 
 /**
@@ -291,6 +315,293 @@ socket_t connect_to_server(const char* ip, int port)
     return sock;
 }
 
+/**
+ * @brief 取消阻塞中的接收，使receive_loop立即返回
+ *
+ * 关闭套接字的读写方向，正在recv()中等待的线程会马上返回而不必等到接收超时。
+ * 套接字本身仍由调用方关闭。
+ */
+void cancel_receive(socket_t sock)
+{
+    running = 0;
+    if (sock != INVALID_SOCKET_FD) {
+        shutdown(sock, SHUTDOWN_BOTH);
+    }
+}
+
+// ========================== io_uring接收后端 ==========================
+
+struct uring;  // 非Linux平台上仅作为不完整类型使用
+
+#ifdef HAVE_IO_URING
+
+/** @brief io_uring队列深度：每次接收提交 recv + 链接超时 两个SQE */
+#define URING_ENTRIES 8
+
+/** @brief 完成事件标识 */
+#define URING_TAG_RECV    1
+#define URING_TAG_TIMEOUT 2
+
+/** @brief 请求已提交后 io_uring_enter 等待失败（非EINTR）的最大重试次数 */
+#define URING_WAIT_RETRIES 3
+
+/**
+ * @struct uring
+ * @brief 最小化的io_uring提交/完成队列映射（直接使用系统调用，不依赖liburing）
+ */
+struct uring {
+    int fd;                       /**< io_uring文件描述符 */
+    unsigned* sq_head;            /**< 提交队列头（内核更新） */
+    unsigned* sq_tail;            /**< 提交队列尾（用户更新） */
+    unsigned* sq_mask;            /**< 提交队列掩码 */
+    unsigned* sq_array;           /**< 提交队列索引数组 */
+    unsigned* cq_head;            /**< 完成队列头（用户更新） */
+    unsigned* cq_tail;            /**< 完成队列尾（内核更新） */
+    unsigned* cq_mask;            /**< 完成队列掩码 */
+    struct io_uring_sqe* sqes;    /**< SQE数组 */
+    struct io_uring_cqe* cqes;    /**< CQE数组 */
+    void* sq_ring;                /**< 提交队列映射 */
+    size_t sq_ring_size;
+    void* cq_ring;                /**< 完成队列映射 */
+    size_t cq_ring_size;
+    size_t sqes_size;             /**< SQE数组映射大小 */
+};
+
+static void uring_teardown(struct uring* ring)
+{
+    if (ring->sqes && ring->sqes != MAP_FAILED) {
+        munmap(ring->sqes, ring->sqes_size);
+    }
+    if (ring->cq_ring && ring->cq_ring != MAP_FAILED) {
+        munmap(ring->cq_ring, ring->cq_ring_size);
+    }
+    if (ring->sq_ring && ring->sq_ring != MAP_FAILED) {
+        munmap(ring->sq_ring, ring->sq_ring_size);
+    }
+    if (ring->fd >= 0) {
+        close(ring->fd);
+    }
+    memset(ring, 0, sizeof(*ring));
+    ring->fd = -1;
+}
+
+/**
+ * @brief 检查内核是否支持接收用到的操作码（RECV 5.6+，LINK_TIMEOUT 5.5+）
+ *
+ * 5.1~5.5 内核上 io_uring_setup 可以成功，但这些请求会以 -EINVAL 完成；
+ * IORING_REGISTER_PROBE 本身在 5.6 之前也会失败，同样视为不支持。
+ */
+static int uring_probe_ops(int fd)
+{
+    size_t len = sizeof(struct io_uring_probe) + IORING_OP_LAST * sizeof(struct io_uring_probe_op);
+    struct io_uring_probe* probe = (struct io_uring_probe*)calloc(1, len);
+    int supported = 0;
+
+    if (!probe) {
+        return 0;
+    }
+    if (syscall(__NR_io_uring_register, fd, IORING_REGISTER_PROBE, probe, IORING_OP_LAST) == 0) {
+        supported = probe->last_op >= IORING_OP_RECV &&
+                    (probe->ops[IORING_OP_RECV].flags & IO_URING_OP_SUPPORTED) &&
+                    (probe->ops[IORING_OP_LINK_TIMEOUT].flags & IO_URING_OP_SUPPORTED);
+    }
+    free(probe);
+    return supported;
+}
+
+static int uring_setup(struct uring* ring, unsigned entries)
+{
+    struct io_uring_params params;
+
+    memset(ring, 0, sizeof(*ring));
+    memset(&params, 0, sizeof(params));
+
+    ring->fd = (int)syscall(__NR_io_uring_setup, entries, &params);
+    if (ring->fd < 0) {
+        return -1;
+    }
+    if (!uring_probe_ops(ring->fd)) {
+        close(ring->fd);
+        return -1;
+    }
+
+    ring->sq_ring_size = params.sq_off.array + params.sq_entries * sizeof(unsigned);
+    ring->cq_ring_size = params.cq_off.cqes + params.cq_entries * sizeof(struct io_uring_cqe);
+    ring->sqes_size = params.sq_entries * sizeof(struct io_uring_sqe);
+
+    ring->sq_ring = mmap(NULL, ring->sq_ring_size, PROT_READ | PROT_WRITE,
+                         MAP_SHARED | MAP_POPULATE, ring->fd, IORING_OFF_SQ_RING);
+    ring->cq_ring = mmap(NULL, ring->cq_ring_size, PROT_READ | PROT_WRITE,
+                         MAP_SHARED | MAP_POPULATE, ring->fd, IORING_OFF_CQ_RING);
+    ring->sqes = mmap(NULL, ring->sqes_size, PROT_READ | PROT_WRITE,
+                      MAP_SHARED | MAP_POPULATE, ring->fd, IORING_OFF_SQES);
+    if (ring->sq_ring == MAP_FAILED || ring->cq_ring == MAP_FAILED || ring->sqes == MAP_FAILED) {
+        uring_teardown(ring);
+        return -1;
+    }
+
+    ring->sq_head = (unsigned*)((uint8_t*)ring->sq_ring + params.sq_off.head);
+    ring->sq_tail = (unsigned*)((uint8_t*)ring->sq_ring + params.sq_off.tail);
+    ring->sq_mask = (unsigned*)((uint8_t*)ring->sq_ring + params.sq_off.ring_mask);
+    ring->sq_array = (unsigned*)((uint8_t*)ring->sq_ring + params.sq_off.array);
+    ring->cq_head = (unsigned*)((uint8_t*)ring->cq_ring + params.cq_off.head);
+    ring->cq_tail = (unsigned*)((uint8_t*)ring->cq_ring + params.cq_off.tail);
+    ring->cq_mask = (unsigned*)((uint8_t*)ring->cq_ring + params.cq_off.ring_mask);
+    ring->cqes = (struct io_uring_cqe*)((uint8_t*)ring->cq_ring + params.cq_off.cqes);
+
+    return 0;
+}
+
+/**
+ * @brief 取得下一个空闲SQE并写入索引数组（尾指针由调用方统一发布）
+ */
+static struct io_uring_sqe* uring_next_sqe(struct uring* ring, unsigned* tail)
+{
+    unsigned index = *tail & *ring->sq_mask;
+    struct io_uring_sqe* sqe = &ring->sqes[index];
+
+    memset(sqe, 0, sizeof(*sqe));
+    ring->sq_array[index] = index;
+    (*tail)++;
+    return sqe;
+}
+
+/**
+ * @brief 通过io_uring执行一次带超时的recv
+ *
+ * 一次提交 recv 与链接超时（与SO_RCVTIMEO相同的时长）两个SQE，等待两者都完成后返回。
+ *
+ * @return 接收的字节数；0表示连接关闭；负数为 -errno
+ */
+static int uring_recv(struct uring* ring, socket_t sock, void* buffer, size_t size)
+{
+    struct __kernel_timespec timeout;
+    struct io_uring_sqe* sqe;
+    unsigned tail = *ring->sq_tail;
+    int result = -EIO;
+    int pending = 2;
+
+    timeout.tv_sec = RECV_TIMEOUT_SEC;
+    timeout.tv_nsec = 0;
+
+    sqe = uring_next_sqe(ring, &tail);
+    sqe->opcode = IORING_OP_RECV;
+    sqe->fd = sock;
+    sqe->addr = (uint64_t)(uintptr_t)buffer;
+    sqe->len = (uint32_t)size;
+    sqe->flags = IOSQE_IO_LINK;
+    sqe->user_data = URING_TAG_RECV;
+
+    sqe = uring_next_sqe(ring, &tail);
+    sqe->opcode = IORING_OP_LINK_TIMEOUT;
+    sqe->addr = (uint64_t)(uintptr_t)&timeout;
+    sqe->len = 1;
+    sqe->user_data = URING_TAG_TIMEOUT;
+
+    __atomic_store_n(ring->sq_tail, tail, __ATOMIC_RELEASE);
+
+    unsigned to_submit = 2;
+    int wait_failures = 0;
+    while (pending > 0) {
+        // 提交并等待；被信号中断时只重新等待，两个请求都完成前不能返回（buffer仍在使用）
+        int ret = (int)syscall(__NR_io_uring_enter, ring->fd, to_submit, (unsigned)pending,
+                               IORING_ENTER_GETEVENTS, NULL, 0);
+        if (ret < 0) {
+            int err = errno;
+            if (err == EINTR) {
+                continue;
+            }
+            // 已提交的请求仍可能在使用buffer，调用方出错后须先 uring_teardown 再释放buffer
+            if (to_submit > 0 || ++wait_failures >= URING_WAIT_RETRIES) {
+                return -err;
+            }
+        } else if (to_submit > 0) {
+            to_submit = (unsigned)ret >= to_submit ? 0 : to_submit - (unsigned)ret;
+        }
+
+        unsigned head = *ring->cq_head;
+        unsigned cq_tail = __atomic_load_n(ring->cq_tail, __ATOMIC_ACQUIRE);
+        while (head != cq_tail) {
+            struct io_uring_cqe* cqe = &ring->cqes[head & *ring->cq_mask];
+            if (cqe->user_data == URING_TAG_RECV) {
+                result = cqe->res;
+            }
+            pending--;
+            head++;
+        }
+        __atomic_store_n(ring->cq_head, head, __ATOMIC_RELEASE);
+    }
+
+    return result;
+}
+
+/**
+ * @brief io_uring版本的recv_full，接收指定长度的完整数据
+ */
+static int recv_full_uring(struct uring* ring, socket_t sock, void* buffer, size_t size)
+{
+    size_t received = 0;
+    uint8_t* ptr = (uint8_t*)buffer;
+
+    while (received < size && running)
+    {
+        int result = uring_recv(ring, sock, ptr + received, size - received);
+
+        if (result <= 0)
+        {
+            if (result == 0)
+            {
+                printf("Connection closed by server\n");
+            }
+            else if (result == -ECANCELED)
+            {
+                printf("recv timed out\n");
+            }
+            else
+            {
+                printf("io_uring recv failed: %s\n", strerror(-result));
+            }
+            return -1;
+        }
+        received += (size_t)result;
+    }
+
+    return received == size ? 0 : -1;
+}
+
+#endif // HAVE_IO_URING
+
+/**
+ * @brief 检测当前系统是否可以使用io_uring接收
+ *
+ * @return 1表示可用，0表示不可用（非Linux、内核过旧或被安全策略禁止）
+ */
+int has_io_uring(void)
+{
+#ifdef HAVE_IO_URING
+    struct uring ring;
+    if (uring_setup(&ring, URING_ENTRIES) == 0) {
+        uring_teardown(&ring);
+        return 1;
+    }
+#endif
+    return 0;
+}
+
+/**
+ * @brief 按所选后端接收完整数据
+ */
+static int recv_full_with(struct uring* ring, socket_t sock, void* buffer, size_t size)
+{
+#ifdef HAVE_IO_URING
+    if (ring) {
+        return recv_full_uring(ring, sock, buffer, size);
+    }
+#endif
+    (void)ring;
+    return recv_full(sock, buffer, size);
+}
+
 // ========================== 内存管理函数 ==========================
 
 /**
@@ -298,12 +609,13 @@ socket_t connect_to_server(const char* ip, int port)
  */
 void init_memory_pool(void)
 {
-    // 预分配8MB解包缓冲区
+    // 预分配三缓冲解包缓冲区，每槽8MB
     g_buffer_size = 8 * 1024 * 1024 / sizeof(uint16_t);
-    g_unpack_buffer = (uint16_t*)malloc(g_buffer_size * sizeof(uint16_t));
+    g_unpack_buffer = (uint16_t*)malloc(UNPACK_SLOT_COUNT * g_buffer_size * sizeof(uint16_t));
+    g_ready_slot = -1;
     
     if (g_unpack_buffer) {
-        printf("Memory pool initialized: %.1f MB\n", 
+        printf("Memory pool initialized: %d x %.1f MB\n", UNPACK_SLOT_COUNT,
                (g_buffer_size * sizeof(uint16_t)) / (1024.0 * 1024.0));
     } else {
         printf("Warning: Failed to allocate memory pool\n");
@@ -317,6 +629,7 @@ void init_memory_pool(void)
 void cleanup_memory_pool(void)
 {
     if (g_unpack_buffer) {
+        g_ready_slot = -1;
         free(g_unpack_buffer);
         g_unpack_buffer = NULL;
         g_buffer_size = 0;
@@ -324,6 +637,85 @@ void cleanup_memory_pool(void)
     }
 }
 
+/**
+ * @brief 把内存池重新分配为 2MB 对齐并提示内核使用透明大页
+ *
+ * 解包槽为数MB的大块内存，用 4KB 页时每次解包/拷贝都要访问上千个页表项，
+ * 改用 2MB 大页可显著减少 TLB 缺失。必须在 init_memory_pool() 之后、
+ * receive_loop() 启动之前调用。
+ *
+ * @param slot_bytes 每个槽期望的字节数（如 宽*高*2），不会小于当前槽大小，向上取整到 2MB；
+ *                   传 0 表示保持当前槽大小
+ * @return 0 成功；-1 平台不支持或分配失败（此时保留原内存池）
+ */
+int pool_enable_hugepages(size_t slot_bytes)
+{
+#if defined(__linux__) && defined(MADV_HUGEPAGE)
+    const size_t huge_page = 2 * 1024 * 1024;
+    size_t current = g_buffer_size * sizeof(uint16_t);
+    void* pool = NULL;
+
+    if (slot_bytes < current) {
+        slot_bytes = current;
+    }
+    if (slot_bytes == 0) {
+        return -1;
+    }
+    slot_bytes = (slot_bytes + huge_page - 1) & ~(huge_page - 1);
+
+    if (posix_memalign(&pool, huge_page, UNPACK_SLOT_COUNT * slot_bytes) != 0) {
+        printf("Warning: Failed to allocate huge-page aligned memory pool\n");
+        return -1;
+    }
+    if (madvise(pool, UNPACK_SLOT_COUNT * slot_bytes, MADV_HUGEPAGE) != 0) {
+        // 内核未开启透明大页时仍使用对齐后的内存，只是没有大页
+        printf("Warning: madvise(MADV_HUGEPAGE) failed: %s\n", strerror(errno));
+    }
+
+    free(g_unpack_buffer);
+    g_unpack_buffer = (uint16_t*)pool;
+    g_buffer_size = slot_bytes / sizeof(uint16_t);
+    g_ready_slot = -1;
+    printf("Memory pool moved to huge pages: %d x %.1f MB\n", UNPACK_SLOT_COUNT,
+           slot_bytes / (1024.0 * 1024.0));
+    return 0;
+#else
+    (void)slot_bytes;
+    return -1;
+#endif
+}
+
+/**
+ * @brief 获取当前可写的解包槽（不是最近发布给读取方的那个）
+ */
+uint16_t* acquire_unpack_slot(void)
+{
+    if (!g_unpack_buffer) {
+        return NULL;
+    }
+    int slot = (g_ready_slot + 1) % UNPACK_SLOT_COUNT;
+#if defined(__GNUC__) || defined(__clang__)
+    // 之前发布的序号必须先于本槽的新数据对读取方可见（seqlock 写端）
+    __atomic_thread_fence(__ATOMIC_RELEASE);
+#endif
+    return g_unpack_buffer + (size_t)slot * g_buffer_size;
+}
+
+/**
+ * @brief 发布已写完的解包槽，读取方随后从该槽读取完整帧
+ */
+void publish_unpack_slot(const uint16_t* slot)
+{
+    int index = (int)((slot - g_unpack_buffer) / g_buffer_size);
+#if defined(__GNUC__) || defined(__clang__)
+    __atomic_store_n(&g_ready_slot, index, __ATOMIC_RELEASE);
+    __atomic_add_fetch(&g_frame_seq, 1, __ATOMIC_RELEASE);
+#else
+    g_ready_slot = index;
+    g_frame_seq++;
+#endif
+}
+
 // ========================== SBGGR10解包函数 ==========================
 
 /**
@@ -347,15 +739,35 @@ void unpack_sbggr10_scalar(const uint8_t raw_bytes[5], uint16_t pixels[4]) {
 #ifdef __AVX2__
 /**
  * @brief SBGGR10格式数据解包（AVX2优化版本）
+ *
+ * 每个块40字节（8组）输出32个像素。每个128位通道处理2组：
+ * 像素k的10位数据位于组内第k、k+1字节组成的16位字中，右移2k位即可取出。
+ * 16字节加载会越过块尾，调用者需保证最后一块之后至少还有6字节可读。
  */
 void unpack_sbggr10_avx2(const uint8_t *raw_data, uint16_t *output, size_t num_blocks) {
+    // 把每个像素所在的两个字节放到对应的16位通道
+    const __m256i shuffle = _mm256_setr_epi8(
+        0, 1, 1, 2, 2, 3, 3, 4, 5, 6, 6, 7, 7, 8, 8, 9,
+        0, 1, 1, 2, 2, 3, 3, 4, 5, 6, 6, 7, 7, 8, 8, 9);
+    // AVX2没有16位可变移位：先左移(6-2k)位去掉高位，再统一右移6位
+    const __m256i multiplier = _mm256_setr_epi16(
+        64, 16, 4, 1, 64, 16, 4, 1,
+        64, 16, 4, 1, 64, 16, 4, 1);
+    
     for (size_t block = 0; block < num_blocks; block++) {
         const uint8_t *src = raw_data + block * 40;
         uint16_t *dst = output + block * 32;
         
-        // 暂时使用标量版本的循环展开
-        for (int i = 0; i < 8; i++) {
-            unpack_sbggr10_scalar(src + i * 5, dst + i * 4);
+        for (int half = 0; half < 2; half++) {
+            const uint8_t *s = src + half * 20;
+            __m256i v = _mm256_inserti128_si256(
+                _mm256_castsi128_si256(_mm_loadu_si128((const __m128i*)s)),
+                _mm_loadu_si128((const __m128i*)(s + 10)), 1);
+            
+            v = _mm256_shuffle_epi8(v, shuffle);
+            v = _mm256_mullo_epi16(v, multiplier);
+            v = _mm256_srli_epi16(v, 6);
+            _mm256_storeu_si256((__m256i*)(dst + half * 16), v);
         }
     }
 }
@@ -375,8 +787,9 @@ void* unpack_worker_thread(void *arg) {
     size_t pixel_pos = task->start_offset / 5 * 4;
     
 #ifdef __AVX2__
-    // AVX2优化：批量处理8个5字节块
-    size_t avx2_blocks = (task->end_offset - raw_pos) / 40;
+    // AVX2优化：批量处理8个5字节块（最后一块之后需留出6字节供16字节加载越界读取）
+    size_t remaining = task->end_offset - raw_pos;
+    size_t avx2_blocks = (remaining >= 46) ? (remaining - 6) / 40 : 0;
     if (avx2_blocks > 0) {
         unpack_sbggr10_avx2(task->raw_data + raw_pos, 
                            task->output_data + pixel_pos, 
@@ -497,6 +910,36 @@ int unpack_sbggr10_image(const uint8_t *raw_data, size_t raw_size,
     return 0;
 }
 
+// ========================== 数据校验函数 ==========================
+
+/**
+ * @brief 计算CRC32校验值（与zlib.crc32兼容，多项式0xEDB88320）
+ */
+uint32_t crc32_compute(const void* data, size_t size)
+{
+    static uint32_t table[256];
+    static int table_ready = 0;
+    const uint8_t* p = (const uint8_t*)data;
+    uint32_t crc = 0xFFFFFFFFu;
+
+    if (!table_ready) {
+        for (uint32_t i = 0; i < 256; i++) {
+            uint32_t c = i;
+            for (int k = 0; k < 8; k++) {
+                c = (c & 1) ? (0xEDB88320u ^ (c >> 1)) : (c >> 1);
+            }
+            table[i] = c;
+        }
+        table_ready = 1;
+    }
+
+    for (size_t i = 0; i < size; i++) {
+        crc = table[(crc ^ p[i]) & 0xFF] ^ (crc >> 8);
+    }
+
+    return crc ^ 0xFFFFFFFFu;
+}
+
 // ========================== 图像数据处理函数 ==========================
 
 /**
@@ -542,16 +985,22 @@ int save_frame(const uint8_t* data, size_t size, uint32_t frame_id,
     if (enable_conversion && pixfmt == 0x30314742 && size % 5 == 0) {
         size_t num_pixels = size / 5 * 4;
         uint16_t* unpacked_pixels = NULL;
+        int from_pool = 0;
         
         // 尝试使用预分配的内存池
         if (g_unpack_buffer && num_pixels <= g_buffer_size) {
-            unpacked_pixels = g_unpack_buffer;
+            unpacked_pixels = acquire_unpack_slot();
+            from_pool = 1;
         } else {
             unpacked_pixels = (uint16_t*)malloc(num_pixels * sizeof(uint16_t));
         }
         
         if (unpacked_pixels) {
             if (unpack_sbggr10_image(data, size, unpacked_pixels, num_pixels) == 0) {
+                if (from_pool) {
+                    publish_unpack_slot(unpacked_pixels);
+                }
+                
                 // 保存解包后的16位数据
                 snprintf(filename, sizeof(filename), "%s/frame_%06d_%dx%d_unpacked.raw",
                         output_dir, frame_id, width, height);
@@ -566,6 +1015,15 @@ int save_frame(const uint8_t* data, size_t size, uint32_t frame_id,
                         printf("Warning: unpacked write incomplete (%zu/%zu bytes)\n", 
                                written_unpacked, unpacked_size);
                         ret = -1;
+                    } else {
+                        // 写入CRC32校验文件，供 verify_unpacked.py --hash-only 快速校验
+                        char crc_filename[MAX_FILENAME_LEN + 8];
+                        snprintf(crc_filename, sizeof(crc_filename), "%s.crc32", filename);
+                        FILE* fp_crc = fopen(crc_filename, "w");
+                        if (fp_crc) {
+                            fprintf(fp_crc, "%08x\n", crc32_compute(unpacked_pixels, unpacked_size));
+                            fclose(fp_crc);
+                        }
                     }
                 } else {
                     printf("Failed to open unpacked output file: %s\n", filename);
@@ -577,7 +1035,7 @@ int save_frame(const uint8_t* data, size_t size, uint32_t frame_id,
             }
             
             // 只有不是预分配缓冲区时才需要释放
-            if (unpacked_pixels != g_unpack_buffer) {
+            if (!from_pool) {
                 free(unpacked_pixels);
             }
         } else {
@@ -599,16 +1057,22 @@ int process_frame_memory_only(const uint8_t* data, size_t size, uint32_t frame_i
     if (enable_conversion && pixfmt == 0x30314742 && size % 5 == 0) {
         size_t num_pixels = size / 5 * 4;
         uint16_t* unpacked_pixels = NULL;
+        int from_pool = 0;
         
         // 尝试使用预分配的内存池
         if (g_unpack_buffer && num_pixels <= g_buffer_size) {
-            unpacked_pixels = g_unpack_buffer;
+            unpacked_pixels = acquire_unpack_slot();
+            from_pool = 1;
         } else {
             unpacked_pixels = (uint16_t*)malloc(num_pixels * sizeof(uint16_t));
         }
         
         if (unpacked_pixels) {
             if (unpack_sbggr10_image(data, size, unpacked_pixels, num_pixels) == 0) {
+                if (from_pool) {
+                    publish_unpack_slot(unpacked_pixels);
+                }
+                
                 // 数据已在内存中处理完成，无需保存文件
                 static int process_count = 0;
                 process_count++;
@@ -618,14 +1082,14 @@ int process_frame_memory_only(const uint8_t* data, size_t size, uint32_t frame_i
                 }
             } else {
                 printf("Failed to unpack SBGGR10 data in memory\n");
-                if (unpacked_pixels != g_unpack_buffer) {
+                if (!from_pool) {
                     free(unpacked_pixels);
                 }
                 return -1;
             }
             
             // 只有不是预分配缓冲区时才需要释放
-            if (unpacked_pixels != g_unpack_buffer) {
+            if (!from_pool) {
                 free(unpacked_pixels);
             }
         } else {
@@ -689,16 +1153,68 @@ void print_stats(void)
     double mbps = (stats.bytes_received / 1024.0 / 1024.0) / elapsed_sec;
 
     printf("\n=== Statistics ===\n");
-    printf("Frames received: %d\n", stats.frames_received);
-    printf("Bytes received: %d (%.2f MB)\n", stats.bytes_received,
+    printf("Frames received: %llu\n", (unsigned long long)stats.frames_received);
+    printf("Bytes received: %llu (%.2f MB)\n", (unsigned long long)stats.bytes_received,
            stats.bytes_received / 1024.0 / 1024.0);
     printf("Elapsed time: %.2f seconds\n", elapsed_sec);
     printf("Average FPS: %.2f\n", stats.avg_fps);
     printf("Data rate: %.2f MB/s\n", mbps);
 }
 
+/**
+ * @brief 一次性填充统计信息和最新帧位置，减少调用方的跨语言访问次数
+ */
+void get_snapshot(struct snapshot* out)
+{
+    int slot;
+
+    if (!out) {
+        return;
+    }
+
+#if defined(__GNUC__) || defined(__clang__)
+    out->frame_seq = __atomic_load_n(&g_frame_seq, __ATOMIC_ACQUIRE);
+    slot = __atomic_load_n(&g_ready_slot, __ATOMIC_ACQUIRE);
+#else
+    out->frame_seq = g_frame_seq;
+    slot = g_ready_slot;
+#endif
+    out->frames_received = stats.frames_received;
+    out->bytes_received = stats.bytes_received;
+    out->avg_fps = stats.avg_fps;
+    out->frame_pixels = g_buffer_size;
+    out->frame = (g_unpack_buffer && slot >= 0)
+                     ? g_unpack_buffer + (size_t)slot * g_buffer_size
+                     : NULL;
+}
+
+/**
+ * @brief 读取当前已发布的帧序号
+ *
+ * 读取方处理完快照中的槽后调用：若序号比快照中的前进了 UNPACK_SLOT_COUNT-1 或更多，
+ * 说明该槽在处理期间可能已被重写，这一帧应丢弃。
+ */
+uint64_t get_frame_seq(void)
+{
+#if defined(__GNUC__) || defined(__clang__)
+    // 读取方之前对槽数据的读取不能排到序号读取之后（seqlock 读端）
+    __atomic_thread_fence(__ATOMIC_ACQUIRE);
+    return __atomic_load_n(&g_frame_seq, __ATOMIC_ACQUIRE);
+#else
+    return g_frame_seq;
+#endif
+}
+
 // ========================== 主接收循环 ==========================
 
+/**
+ * @brief 注册帧就绪回调，传入NULL取消注册
+ */
+void set_frame_ready_cb(frame_ready_cb_t cb)
+{
+    g_frame_ready_cb = cb;
+}
+
 /**
  * @brief 图像数据接收主循环
  */
@@ -706,21 +1222,43 @@ int receive_loop(socket_t sock, const struct client_config* config)
 {
     uint8_t* frame_buffer = NULL;
     size_t buffer_size = 0;
+    struct uring* ring = NULL;
+    // 开关位在循环外解出一次
+    const int enable_save = (config->flags & CONFIG_ENABLE_SAVE) != 0;
+    const int enable_conversion = (config->flags & CONFIG_ENABLE_CONVERSION) != 0;
+    const int use_io_uring = (config->flags & CONFIG_USE_IO_URING) != 0;
+    const uint32_t save_interval = config->save_interval ? config->save_interval : 1;
+#ifdef HAVE_IO_URING
+    struct uring uring_storage;
+
+    if (use_io_uring) {
+        if (uring_setup(&uring_storage, URING_ENTRIES) == 0) {
+            ring = &uring_storage;
+            printf("Receive backend: io_uring\n");
+        } else {
+            printf("io_uring unavailable, falling back to recv()\n");
+        }
+    }
+#else
+    if (use_io_uring) {
+        printf("io_uring not supported on this platform, using recv()\n");
+    }
+#endif
 
     printf("Starting receive loop (Ctrl+C to stop)...\n");
-    if (config->enable_save) {
+    if (enable_save) {
         printf("Frames will be saved to: %s\n", config->output_dir);
-        printf("SBGGR10 conversion: %s\n", config->enable_conversion ? "Enabled" : "Disabled");
+        printf("SBGGR10 conversion: %s\n", enable_conversion ? "Enabled" : "Disabled");
     } else {
         printf("Memory-only mode: No files will be saved\n");
-        printf("SBGGR10 processing: %s\n", config->enable_conversion ? "In-memory conversion" : "No processing");
+        printf("SBGGR10 processing: %s\n", enable_conversion ? "In-memory conversion" : "No processing");
     }
 
     while (running) {
         struct frame_header header;
 
         // 接收帧头
-        if (recv_full(sock, &header, sizeof(header)) < 0) {
+        if (recv_full_with(ring, sock, &header, sizeof(header)) < 0) {
             break;
         }
 
@@ -748,7 +1286,7 @@ int receive_loop(socket_t sock, const struct client_config* config)
         }
 
         // 接收帧数据
-        if (recv_full(sock, frame_buffer, header.size) < 0) {
+        if (recv_full_with(ring, sock, frame_buffer, header.size) < 0) {
             break;
         }
 
@@ -756,13 +1294,13 @@ int receive_loop(socket_t sock, const struct client_config* config)
         print_frame_info(&header);
 
         // 处理帧（保存或仅内存处理）
-        if (header.frame_id % config->save_interval == 0) {
-            if (config->enable_save) {
+        if (header.frame_id % save_interval == 0) {
+            if (enable_save) {
                 // 文件保存模式
                 if (save_frame(frame_buffer, header.size, header.frame_id,
                               header.width, header.height, header.pixfmt,
-                              config->enable_conversion, config->output_dir) == 0) {
-                    if (config->enable_conversion && header.pixfmt == 0x30314742) {
+                              enable_conversion, config->output_dir) == 0) {
+                    if (enable_conversion && header.pixfmt == 0x30314742) {
                         printf("  -> Saved RAW + unpacked files\n");
                     } else {
                         printf("  -> Saved RAW file\n");
@@ -771,8 +1309,8 @@ int receive_loop(socket_t sock, const struct client_config* config)
             } else {
                 // 仅内存处理模式
                 if (process_frame_memory_only(frame_buffer, header.size, header.frame_id,
-                                            header.pixfmt, config->enable_conversion) == 0) {
-                    if (config->enable_conversion && header.pixfmt == 0x30314742) {
+                                            header.pixfmt, enable_conversion) == 0) {
+                    if (enable_conversion && header.pixfmt == 0x30314742) {
                         printf("  -> Processed in memory (converted)\n");
                     } else {
                         printf("  -> Processed in memory (raw)\n");
@@ -784,13 +1322,28 @@ int receive_loop(socket_t sock, const struct client_config* config)
         // 更新统计
         update_stats(header.size);
 
+        // 把原始帧交给调用方
+        if (config->on_frame) {
+            config->on_frame(&header, frame_buffer, header.size);
+        }
+
+        // 通知读取方有新帧
+        if (g_frame_ready_cb) {
+            g_frame_ready_cb(header.frame_id);
+        }
+
         // 每100帧显示一次统计
         if (stats.frames_received % 100 == 0) {
-            printf("Received %d frames, avg FPS: %.2f\n",
-                   stats.frames_received, stats.avg_fps);
+            printf("Received %llu frames, avg FPS: %.2f\n",
+                   (unsigned long long)stats.frames_received, stats.avg_fps);
         }
     }
 
+#ifdef HAVE_IO_URING
+    if (ring) {
+        uring_teardown(ring);
+    }
+#endif
     free(frame_buffer);
     return 0;
 }
@@ -29,6 +29,7 @@ void print_usage(const char* prog_name)
     printf("  -o, --output DIR    Alias for --save-path (deprecated)\n");
     printf("  -c, --convert       Enable SBGGR10 to 16-bit conversion (default: disabled)\n");
     printf("  -i, --interval N    Save every Nth frame (default: 1)\n");
+    printf("  -u, --io-uring      Receive via io_uring (Linux only, falls back to recv)\n");
     printf("\nSave Modes:\n");
     printf("  Memory-only (default): Frames processed in RAM, real-time overwrite\n");
     printf("  File save (-S DIR):    Frames saved to disk for analysis\n");
@@ -50,9 +51,10 @@ int parse_arguments(int argc, char* argv[], struct client_config* config)
     config->server_ip = DEFAULT_SERVER_IP;
     config->port = DEFAULT_PORT;
     config->output_dir = NULL;           // 默认不保存到文件
-    config->enable_conversion = 0;       // 默认不启用转换
+    config->flags = 0;                   // 默认仅内存模式、不启用转换、使用recv接收
     config->save_interval = 1;
-    config->enable_save = 0;             // 默认仅内存模式
+    config->reserved = 0;
+    config->on_frame = NULL;             // 命令行模式不需要逐帧回调
 
     // 解析命令行参数
     for (int i = 1; i < argc; i++) {
@@ -83,7 +85,7 @@ int parse_arguments(int argc, char* argv[], struct client_config* config)
         else if (strcmp(argv[i], "-S") == 0 || strcmp(argv[i], "--save-path") == 0) {
             if (++i < argc) {
                 config->output_dir = argv[i];
-                config->enable_save = 1;    // 启用文件保存
+                config->flags |= CONFIG_ENABLE_SAVE;    // 启用文件保存
             } else {
                 printf("Error: --save-path requires a directory path\n");
                 return -1;
@@ -94,22 +96,26 @@ int parse_arguments(int argc, char* argv[], struct client_config* config)
             printf("Warning: -o/--output is deprecated, use -S/--save-path instead\n");
             if (++i < argc) {
                 config->output_dir = argv[i];
-                config->enable_save = 1;    // 启用文件保存
+                config->flags |= CONFIG_ENABLE_SAVE;    // 启用文件保存
             } else {
                 printf("Error: --output requires a directory path\n");
                 return -1;
             }
         }
         else if (strcmp(argv[i], "-c") == 0 || strcmp(argv[i], "--convert") == 0) {
-            config->enable_conversion = 1;
+            config->flags |= CONFIG_ENABLE_CONVERSION;
+        }
+        else if (strcmp(argv[i], "-u") == 0 || strcmp(argv[i], "--io-uring") == 0) {
+            config->flags |= CONFIG_USE_IO_URING;
         }
         else if (strcmp(argv[i], "-i") == 0 || strcmp(argv[i], "--interval") == 0) {
             if (++i < argc) {
-                config->save_interval = atoi(argv[i]);
-                if (config->save_interval <= 0) {
+                int interval = atoi(argv[i]);
+                if (interval <= 0 || interval > UINT16_MAX) {
                     printf("Error: Invalid interval number\n");
                     return -1;
                 }
+                config->save_interval = (uint16_t)interval;
             } else {
                 printf("Error: --interval requires a number\n");
                 return -1;
@@ -123,7 +129,7 @@ int parse_arguments(int argc, char* argv[], struct client_config* config)
     }
 
     // 如果没有指定保存路径，设置为默认输出目录（仅用于显示）
-    if (!config->enable_save) {
+    if (!(config->flags & CONFIG_ENABLE_SAVE)) {
         config->output_dir = "[Memory Only]";
     }
 
@@ -148,8 +154,8 @@ int main(int argc, char* argv[])
     printf("V4L2 USB RAW Image Receiver (Cross-Platform PC Client)\n");
     printf("=====================================================\n");
     printf("Server: %s:%d\n", config.server_ip, config.port);
-    printf("Mode: %s\n", config.enable_save ? "File Save" : "Memory Only");
-    if (config.enable_save) {
+    printf("Mode: %s\n", (config.flags & CONFIG_ENABLE_SAVE) ? "File Save" : "Memory Only");
+    if (config.flags & CONFIG_ENABLE_SAVE) {
         printf("Save path: %s\n", config.output_dir);
         printf("Save interval: every %d frame(s)\n", config.save_interval);
     } else {
@@ -158,7 +164,7 @@ int main(int argc, char* argv[])
 
     // 显示处理特性信息
     printf("\nImage Processing Features:\n");
-    if (config.enable_conversion) {
+    if (config.flags & CONFIG_ENABLE_CONVERSION) {
         printf("- SBGGR10 format conversion: ENABLED\n");
         printf("- Multi-threaded processing (%d CPU cores detected)\n", get_cpu_cores());
 #ifdef __AVX2__
@@ -168,14 +174,14 @@ int main(int argc, char* argv[])
 #else
         printf("- Scalar processing (no SIMD acceleration)\n");
 #endif
-        if (config.enable_save) {
+        if (config.flags & CONFIG_ENABLE_SAVE) {
             printf("- Output: RAW files + unpacked 16-bit files for SBGGR10\n");
         } else {
             printf("- Processing: In-memory SBGGR10 conversion (no file output)\n");
         }
     } else {
         printf("- SBGGR10 format conversion: DISABLED\n");
-        if (config.enable_save) {
+        if (config.flags & CONFIG_ENABLE_SAVE) {
             printf("- Output: RAW files only\n");
         } else {
             printf("- Processing: In-memory only (no conversion, no file output)\n");
@@ -198,12 +204,12 @@ int main(int argc, char* argv[])
 #endif
 
     // 初始化内存池（如果启用转换）
-    if (config.enable_conversion) {
+    if (config.flags & CONFIG_ENABLE_CONVERSION) {
         init_memory_pool();
     }
 
     // 创建输出目录（仅在文件保存模式下）
-    if (config.enable_save) {
+    if (config.flags & CONFIG_ENABLE_SAVE) {
         if (create_output_dir(config.output_dir) < 0) {
             cleanup_network();
             cleanup_memory_pool();
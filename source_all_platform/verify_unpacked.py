@@ -4,15 +4,38 @@
 
 用法：
 python verify_unpacked.py frame_000001_1920x1080_unpacked.raw 1920 1080
+python verify_unpacked.py frame_000001_1920x1080_unpacked.raw 1920 1080 --no-display  # 仅验证
+python verify_unpacked.py frames/*_unpacked.raw 1920 1080  # 批量验证多帧
 
 这个脚本将读取C程序输出的解包数据，并与Python版本的解包算法进行对比验证。
 """
 
+import argparse
+import os
 import sys
+import zlib
 import numpy as np
-import matplotlib.pyplot as plt
+from numpy.lib.stride_tricks import as_strided
 from pathlib import Path
 
+try:
+    import numba
+except ImportError:
+    numba = None  # 未安装 Numba 时使用 NumPy 向量化版本
+
+# 各位宽的打包方式：(每组字节数, 每组像素数)
+# 每组字节按小端序拼接后，从高位到低位依次取出像素（与SBGGR10参考实现一致）
+# 10位为C解包算法（SBGGR10）的布局，8/16位为不打包的逐像素存储
+# C程序没有实现12/14位解包，其打包布局也不是这种整组拼接方式，因此不收录
+RAW_PACKING = {
+    8: (1, 1),
+    10: (5, 4),
+    16: (2, 1),
+}
+
+# 流式验证每块处理的RAW字节数（需为5的倍数，约1MB）
+VERIFY_CHUNK_BYTES = 5 * 200 * 1024
+
 def load_unpacked_image(filename, width, height):
     """
     加载C程序解包后的16位图像数据
@@ -26,107 +49,284 @@ def load_unpacked_image(filename, width, height):
         numpy数组，形状为(height, width)，dtype=uint16
     """
     try:
-        # 读取16位小端序数据
-        data = np.fromfile(filename, dtype=np.uint16)
         expected_pixels = width * height
+        file_size = os.path.getsize(filename)
         
-        if len(data) != expected_pixels:
-            print(f"Warning: Expected {expected_pixels} pixels, got {len(data)}")
+        if file_size < expected_pixels * 2:
+            print(f"Error: Expected {expected_pixels} pixels, got {file_size // 2}")
+            return None
+        if file_size != expected_pixels * 2:
+            print(f"Warning: Expected {expected_pixels} pixels, got {file_size // 2}")
         
-        # 重整为图像形状
-        image = data[:expected_pixels].reshape(height, width)
+        # 以只读内存映射方式打开16位小端序数据，按需分页读入
+        image = np.memmap(filename, dtype=np.uint16, mode='r', shape=(height, width))
         return image
     except Exception as e:
         print(f"Error loading unpacked image: {e}")
         return None
 
+def _make_unpacker_numba(bpp):
+    """
+    生成指定位宽的解包内核（Numba JIT，多线程单次遍历）
+    
+    组大小、移位量和掩码都是编译期常量，内层循环可被完全展开和向量化。
+    """
+    group_bytes, group_pixels = RAW_PACKING[bpp]
+    mask = (1 << bpp) - 1
+    
+    @numba.njit(parallel=True, boundscheck=False, cache=True)
+    def unpack_kernel(raw, out):
+        for g in numba.prange(len(raw) // group_bytes):
+            i = g * group_bytes
+            
+            # 按小端序拼接一组字节
+            val = np.uint64(0)
+            for k in range(group_bytes):
+                val |= np.uint64(raw[i + k]) << np.uint64(8 * k)
+            
+            # 从高位到低位依次取出像素
+            j = g * group_pixels
+            for k in range(group_pixels):
+                out[j + k] = (val >> np.uint64(bpp * (group_pixels - 1 - k))) & np.uint64(mask)
+    
+    return unpack_kernel
+
+def _unpack_numpy(raw, bpp):
+    """
+    NumPy SWAR解包实现（Numba 不可用时的回退路径）
+    
+    每组字节按步长视图读成一个64位字，再整列移位/掩码取出各像素字段。
+    """
+    group_bytes, group_pixels = RAW_PACKING[bpp]
+    groups = raw.size // group_bytes
+    n = groups * group_bytes
+    
+    # 末尾补零，保证最后一组也能完整读出8字节
+    padded = np.zeros(n + 8, dtype=np.uint8)
+    padded[:n] = raw[:n]
+    words = as_strided(padded, shape=(groups, 8), strides=(group_bytes, 1),
+                       writeable=False).view('<u8')[:, 0]
+    
+    out = np.empty((groups, group_pixels), dtype=np.uint16)
+    mask = np.uint64((1 << bpp) - 1)
+    for k in range(group_pixels):
+        shift = np.uint64(bpp * (group_pixels - 1 - k))
+        np.bitwise_and(np.right_shift(words, shift), mask, out=out[:, k], casting='unsafe')
+    
+    return out.ravel()
+
+# 每种位宽一个专用内核，按位宽查表分发
+if numba is not None:
+    _UNPACKERS = {bpp: _make_unpacker_numba(bpp) for bpp in RAW_PACKING}
+else:
+    _UNPACKERS = {}
+
+def python_unpack(raw_data, bpp):
+    """
+    Python版本的RAW解包算法（用于验证）
+    
+    优先使用 Numba 内核，不可用时回退到 NumPy 向量化实现。
+    """
+    if bpp not in RAW_PACKING:
+        raise ValueError(f"Unsupported bit width: {bpp}")
+    
+    raw = np.frombuffer(raw_data, dtype=np.uint8)
+    
+    if bpp in _UNPACKERS:
+        group_bytes, group_pixels = RAW_PACKING[bpp]
+        out = np.empty((len(raw) // group_bytes) * group_pixels, dtype=np.uint16)
+        _UNPACKERS[bpp](raw, out)
+        return out
+    
+    return _unpack_numpy(raw, bpp)
+
 def python_unpack_sbggr10(raw_data):
     """
     Python版本的SBGGR10解包算法（用于验证）
     """
-    img = []
+    return python_unpack(raw_data, 10)
+
+def python_unpack_sbggr10_reference(raw_data):
+    """
+    SBGGR10解包的逐组标量参考实现（可读性优先，速度很慢）
+    """
+    groups = len(raw_data) // 5
+    data = bytes(raw_data[:groups * 5])  # 转为 bytes，索引直接得到 Python int
+    out = np.empty(groups * 4, dtype=np.uint16)
     
-    for i in range(0, len(raw_data), 5):
-        if i + 4 >= len(raw_data):
-            break
-            
+    for g in range(groups):
+        i = g * 5
+        
         # 重构40位数据
-        pixels_bin = f"{raw_data[i+4]:08b}{raw_data[i+3]:08b}{raw_data[i+2]:08b}{raw_data[i+1]:08b}{raw_data[i+0]:08b}"
+        val = (data[i+4] << 32) | (data[i+3] << 24) | (data[i+2] << 16) | (data[i+1] << 8) | data[i]
         
-        px1 = int(pixels_bin[0:10], 2)   # 前10位
-        px2 = int(pixels_bin[10:20], 2)  # 中间10位
-        px3 = int(pixels_bin[20:30], 2)  # 后10位
-        px4 = int(pixels_bin[30:40], 2)  # 最后10位
+        px1 = (val >> 30) & 0x3FF  # 前10位
+        px2 = (val >> 20) & 0x3FF  # 中间10位
+        px3 = (val >> 10) & 0x3FF  # 后10位
+        px4 = val & 0x3FF          # 最后10位
         
-        img.extend([px1, px2, px3, px4])
+        out[4*g:4*g+4] = (px1, px2, px3, px4)
     
-    return np.array(img, dtype=np.uint16)
+    return out
 
-def verify_unpacking(raw_filename, unpacked_filename):
+def verify_checksum(unpacked_filename):
+    """
+    用C程序写出的 .crc32 校验文件快速检查解包文件
+    
+    Returns:
+        True/False 表示校验值是否一致，None 表示没有可用的校验文件
+    """
+    crc_filename = unpacked_filename + '.crc32'
+    try:
+        with open(crc_filename) as f:
+            expected = int(f.read().strip(), 16)
+        
+        if os.path.getsize(unpacked_filename) == 0:
+            actual = zlib.crc32(b'')
+        else:
+            actual = zlib.crc32(np.memmap(unpacked_filename, dtype=np.uint8, mode='r'))
+    except (OSError, ValueError):
+        return None
+    
+    if actual != expected:
+        print(f"CRC32 mismatch: expected {expected:08x}, got {actual:08x}")
+        return False
+    return True
+
+def verify_unpacking(raw_filename, unpacked_filename, scratch=None, reference=False,
+                     hash_only=False):
     """
     验证C语言解包结果与Python解包结果的一致性
+    
+    按 VERIFY_CHUNK_BYTES 分块流式解包并比较，内存占用与帧大小无关。
+    scratch 为可复用的差异掩码缓冲区（见 verify_batch），为空时自动分配。
+    reference 为 True 时使用逐组标量参考实现解包（很慢，用于交叉检查）。
+    hash_only 为 True 时先比对 .crc32 校验文件，一致则跳过Python解包。
     """
     print("Verifying unpacking algorithm...")
     
+    if hash_only:
+        if verify_checksum(unpacked_filename):
+            print("✓ Verification PASSED: CRC32 matches C program checksum")
+            return True
+        print("Checksum unavailable or mismatched, falling back to full decode")
+    
     # 读取原始RAW数据
     try:
-        raw_data = np.fromfile(raw_filename, dtype=np.uint8)
+        raw_data = np.memmap(raw_filename, dtype=np.uint8, mode='r')
         print(f"Loaded RAW data: {len(raw_data)} bytes")
     except:
         print(f"Warning: Could not load RAW file {raw_filename} for verification")
         return True  # 跳过验证
     
-    # Python解包
-    python_result = python_unpack_sbggr10(raw_data)
-    print(f"Python unpacked: {len(python_result)} pixels")
+    raw_size = (len(raw_data) // 5) * 5
+    print(f"Python unpacked: {raw_size // 5 * 4} pixels")
     
     # 读取C语言解包结果
     try:
-        c_result = np.fromfile(unpacked_filename, dtype=np.uint16)
+        c_result = np.memmap(unpacked_filename, dtype=np.uint16, mode='r')
         print(f"C unpacked: {len(c_result)} pixels")
     except:
         print(f"Error: Could not load C unpacked file {unpacked_filename}")
         return False
     
     # 比较结果
-    min_len = min(len(python_result), len(c_result))
+    python_len = raw_size // 5 * 4
+    min_len = min(python_len, len(c_result))
     if min_len == 0:
         print("Error: No data to compare")
         return False
+    if python_len != len(c_result):
+        print(f"Warning: Size mismatch (Python {python_len} pixels, C {len(c_result)} pixels), "
+              f"comparing first {min_len} pixels only")
+    
+    if scratch is None:
+        scratch = np.empty(VERIFY_CHUNK_BYTES // 5 * 4, dtype=bool)
+    unpack = python_unpack_sbggr10_reference if reference else python_unpack_sbggr10
+    
+    diff_count = 0
+    first_diffs = []  # (像素索引, Python值, C值)
     
-    python_result = python_result[:min_len]
-    c_result = c_result[:min_len]
+    for raw_off in range(0, raw_size, VERIFY_CHUNK_BYTES):
+        pixel_off = raw_off // 5 * 4
+        if pixel_off >= min_len:
+            break
+        
+        # 逐块解包并与C结果的对应区间比较
+        python_tile = unpack(raw_data[raw_off:raw_off + VERIFY_CHUNK_BYTES])
+        pixel_end = min(pixel_off + len(python_tile), min_len)
+        python_tile = python_tile[:pixel_end - pixel_off]
+        c_tile = c_result[pixel_off:pixel_end]
+        
+        # 一致时 array_equal 即可返回，只有不一致才生成差异掩码
+        if np.array_equal(python_tile, c_tile):
+            continue
+        
+        diff = np.not_equal(python_tile, c_tile, out=scratch[:len(c_tile)])
+        tile_diffs = np.count_nonzero(diff)
+        diff_count += tile_diffs
+        for idx in np.flatnonzero(diff)[:10 - len(first_diffs)]:
+            first_diffs.append((pixel_off + idx, python_tile[idx], c_tile[idx]))
     
-    if np.array_equal(python_result, c_result):
+    if diff_count == 0:
         print("✓ Verification PASSED: C and Python results are identical")
         return True
     else:
-        diff_count = np.sum(python_result != c_result)
         print(f"✗ Verification FAILED: {diff_count}/{min_len} pixels differ")
         
         # 显示前几个差异
-        diff_indices = np.where(python_result != c_result)[0][:10]
-        for idx in diff_indices:
-            print(f"  Pixel {idx}: Python={python_result[idx]}, C={c_result[idx]}")
+        for idx, python_val, c_val in first_diffs:
+            print(f"  Pixel {idx}: Python={python_val}, C={c_val}")
         
         return False
 
+def verify_batch(unpacked_files, reference=False, hash_only=False):
+    """
+    批量验证多帧解包结果，所有帧共用同一个差异掩码缓冲区
+    """
+    scratch = np.empty(VERIFY_CHUNK_BYTES // 5 * 4, dtype=bool)
+    passed = 0
+    failed = 0
+    
+    for unpacked_file in unpacked_files:
+        raw_file = unpacked_file.replace('_unpacked.raw', '.BG10')
+        if not Path(raw_file).exists():
+            print(f"Skipping {unpacked_file}: RAW file {raw_file} not found")
+            continue
+        
+        print(f"\n[{passed + failed + 1}] {unpacked_file}")
+        if verify_unpacking(raw_file, unpacked_file, scratch, reference, hash_only):
+            passed += 1
+        else:
+            failed += 1
+    
+    print(f"\nBatch verification: {passed} passed, {failed} failed")
+    return failed == 0
+
 def display_image(image, title="Unpacked Image"):
     """
     显示解包后的图像
     """
+    import matplotlib.pyplot as plt  # 仅在需要显示时才导入（启动开销较大）
+    from matplotlib.colors import Normalize
+    
     plt.figure(figsize=(12, 8))
     
-    # 显示原图（缩放到8位用于显示）
+    # 10位数据直接显示，由 matplotlib 在绘制时归一化，不生成8位副本
+    norm = Normalize(vmin=0, vmax=1023)
+    
+    # 显示原图
     plt.subplot(221)
-    display_img = (image >> 2).astype(np.uint8)  # 10位->8位
-    plt.imshow(display_img, cmap='gray')
-    plt.title(f'{title} (10->8 bit)')
+    plt.imshow(image, cmap='gray', norm=norm)
+    plt.title(f'{title} (10-bit)')
     plt.colorbar()
     
     # 显示直方图
     plt.subplot(222)
-    plt.hist(image.flatten(), bins=256, alpha=0.7)
+    counts = np.bincount(image.ravel(), minlength=1024)
+    counts = np.pad(counts, (0, -len(counts) % 4))
+    binned = counts.reshape(-1, 4).sum(axis=1)  # 每4个值合并为一个bin（10位 -> 256 bins）
+    plt.stairs(binned, np.arange(len(binned) + 1) * 4, fill=True, alpha=0.7)
     plt.title('Pixel Value Histogram')
     plt.xlabel('Pixel Value (10-bit)')
     plt.ylabel('Count')
@@ -148,21 +348,35 @@ Std: {image.std():.1f}
     plt.subplot(224)
     h, w = image.shape
     crop = image[h//4:h//4+100, w//4:w//4+100]
-    plt.imshow((crop >> 2).astype(np.uint8), cmap='gray')
+    plt.imshow(crop, cmap='gray', norm=norm)
     plt.title('Cropped Region (100x100)')
     
     plt.tight_layout()
     plt.show()
 
 def main():
-    if len(sys.argv) != 4:
-        print("Usage: python verify_unpacked.py <unpacked_file> <width> <height>")
-        print("Example: python verify_unpacked.py frame_000001_1920x1080_unpacked.raw 1920 1080")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="验证C语言解包算法的正确性和显示解包后的图像",
+        epilog="Example: python verify_unpacked.py frame_000001_1920x1080_unpacked.raw 1920 1080")
+    parser.add_argument("unpacked_files", nargs="+", metavar="unpacked_file",
+                        help="C程序输出的解包文件 (*_unpacked.raw)，多个文件时仅批量验证")
+    parser.add_argument("width", type=int, help="图像宽度")
+    parser.add_argument("height", type=int, help="图像高度")
+    parser.add_argument("--no-display", action="store_true",
+                        help="仅验证，不显示图像（不导入 matplotlib）")
+    parser.add_argument("--reference", action="store_true",
+                        help="使用逐组标量参考实现验证（很慢，用于交叉检查）")
+    parser.add_argument("--hash-only", action="store_true",
+                        help="优先用 .crc32 校验文件验证，不一致时再完整解包比较")
+    args = parser.parse_args()
+    
+    # 多个文件：批量验证后退出
+    if len(args.unpacked_files) > 1:
+        sys.exit(0 if verify_batch(args.unpacked_files, args.reference, args.hash_only) else 1)
     
-    unpacked_file = sys.argv[1]
-    width = int(sys.argv[2])
-    height = int(sys.argv[3])
+    unpacked_file = args.unpacked_files[0]
+    width = args.width
+    height = args.height
     
     print(f"Loading unpacked image: {unpacked_file}")
     print(f"Expected dimensions: {width}x{height}")
@@ -179,13 +393,18 @@ def main():
     # 验证解包算法（如果有对应的RAW文件）
     raw_file = unpacked_file.replace('_unpacked.raw', '.BG10')
     if Path(raw_file).exists():
-        verify_unpacking(raw_file, unpacked_file)
+        verify_unpacking(raw_file, unpacked_file, reference=args.reference,
+                         hash_only=args.hash_only)
+    
+    if args.no_display:
+        print("\nImage processing completed!")
+        return
     
     # 显示图像
     display_image(image, f"Frame {width}x{height}")
     
     print("\nImage processing completed!")
-    print("Note: The displayed image is converted from 10-bit to 8-bit for visualization.")
+    print("Note: The displayed image is linearly mapped from the 10-bit range (0-1023) for visualization.")
     print("For accurate analysis, use the original 16-bit data.")
 
 if __name__ == "__main__":
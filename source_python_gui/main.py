@@ -18,12 +18,11 @@ Version: 2.0.0
 """
 
 import sys
-import os
 import time
 import ctypes
 from ctypes import POINTER, Structure, c_char_p, c_int, c_uint32, c_void_p, c_bool
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 import threading
 
 import numpy as np
@@ -35,18 +34,49 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import QThread, Signal, QTimer, Qt
 from PySide6.QtGui import QPixmap, QImage
 
+try:
+    import numba
+except ImportError:
+    numba = None  # 未安装 Numba 时使用 NumPy 实现
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None  # 未安装 OpenCV 时使用 NumPy 实现
+
+try:
+    from PySide6.QtGui import QSurfaceFormat
+    from PySide6.QtOpenGL import (
+        QOpenGLShader, QOpenGLShaderProgram, QOpenGLTexture,
+        QOpenGLVertexArrayObject, QOpenGLPixelTransferOptions
+    )
+    from PySide6.QtOpenGLWidgets import QOpenGLWidget
+except ImportError:
+    QOpenGLWidget = None  # 缺少 Qt OpenGL 模块时只能使用 CPU 显示路径
+
 # ========================== 常量定义 ==========================
 
 # 默认配置
 DEFAULT_SERVER_IP = "172.32.0.93"
 DEFAULT_PORT = 8888
+FRAME_HEADER_SIZE = 40  # 帧头在线上的字节数（C 端 sizeof(struct frame_header)）
+
+# C 端解包槽数（与 v4l2_usb_pc.h 中的 UNPACK_SLOT_COUNT 一致）
+UNPACK_SLOT_COUNT = 3
 
 # 图像参数
 DEFAULT_WIDTH = 1920
 DEFAULT_HEIGHT = 1080
+CONTRAST_LUT_TOLERANCE = 8  # 拉伸范围变化超过该值才重建对比度查找表
 
 # UI 配置
 UPDATE_INTERVAL = 100  # 界面更新间隔 (ms)
+STATS_LOG_INTERVAL = 1.0  # verbose 模式下 RAW 统计信息的最短打印间隔 (s)
+
+# OpenGL 显示模式（片段着色器中的 u_mode）
+GL_MODE_GRAY = 0
+GL_MODE_FALSE_COLOR = 1
+GL_MODE_RGB = 2
 
 # ========================== 通用类定义 ==========================
 
@@ -61,10 +91,76 @@ class FrameInfo:
         self.total_frames = 0
         self.is_connected = False
 
+# ========================== 图像处理内核 ==========================
+
+def build_heatmap_lut() -> np.ndarray:
+    """生成热图伪彩色查找表 (256 x 3)，每个 8-bit 灰度值对应一个 RGB 颜色"""
+    gray = np.arange(256, dtype=np.float32)
+    lut = np.empty((256, 3), dtype=np.uint8)
+    lut[:, 0] = np.clip(gray * 1.5 - 128, 0, 255)   # 红色通道
+    lut[:, 1] = np.clip(np.abs(gray - 128) * 2, 0, 255)  # 绿色通道
+    lut[:, 2] = np.clip(255 - gray * 1.5, 0, 255)   # 蓝色通道
+    return lut
+
+if numba is not None:
+    @numba.njit(inline='always')
+    def _stretch_value(value, p1, p99):
+        """单个像素的对比度拉伸，结果为 0-255"""
+        scale = p99 - p1
+        v = min(max(np.int32(value), p1), p99)
+        return ((v - p1) * 255) // scale if scale > 0 else 0
+    
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _stretch_gray_kernel(image_16bit, p1, p99, out_gray):
+        """对比度拉伸，单次遍历写入 8-bit 灰度输出"""
+        height, width = image_16bit.shape
+        for y in numba.prange(height):
+            for x in range(width):
+                out_gray[y, x] = _stretch_value(image_16bit[y, x], p1, p99)
+    
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _stretch_false_color_kernel(image_16bit, p1, p99, out_rgb):
+        """对比度拉伸 + 伪彩色映射，单次遍历写入 RGB 输出"""
+        height, width = image_16bit.shape
+        for y in numba.prange(height):
+            for x in range(width):
+                n = _stretch_value(image_16bit[y, x], p1, p99)
+                out_rgb[y, x, 0] = max((3 * n) // 2 - 128, 0)
+                out_rgb[y, x, 1] = min(abs(n - 128) * 2, 255)
+                out_rgb[y, x, 2] = max(255 - (3 * n + 1) // 2, 0)
+
 # ========================== C 库接口定义 ==========================
 
+# 根据平台选择库文件
+if sys.platform == "win32":
+    LIB_NAME = "libv4l2_usb_pc.dll"
+elif sys.platform == "darwin":
+    LIB_NAME = "libv4l2_usb_pc.dylib"
+else:
+    LIB_NAME = "libv4l2_usb_pc.so"
+
+# 库文件查找路径（导入时构建一次）
+_HERE = Path(__file__).resolve().parent
+_LIB_CANDIDATES = (
+    _HERE / LIB_NAME,
+    _HERE.parent / "source_all_platform" / "build_native" / "dist" / "linux_x86_64" / "lib" / LIB_NAME,
+    _HERE.parent / "source_all_platform" / "lib" / LIB_NAME,
+    Path(LIB_NAME)  # 当前目录
+)
+
+def _open_lib() -> ctypes.CDLL:
+    """依次直接 dlopen 候选路径；缺失的文件由 OSError 跳过，不再先 stat 再加载"""
+    errors = []
+    for lib_path in _LIB_CANDIDATES:
+        try:
+            return ctypes.CDLL(str(lib_path))
+        except OSError as e:
+            errors.append(str(e))
+    raise FileNotFoundError(f"找不到 C 库文件: {LIB_NAME}\n" + "\n".join(errors))
+
 class FrameHeader(Structure):
-    """帧头结构体（对应 C 中的 frame_header）"""
+    """帧头结构体（对应 C 中的 frame_header，线上格式，紧凑排列）"""
+    _pack_ = 1  # 与 C 端 __attribute__((packed)) 一致，布局不随编译器对齐规则变化
     _fields_ = [
         ("magic", c_uint32),
         ("frame_id", c_uint32),
@@ -76,15 +172,28 @@ class FrameHeader(Structure):
         ("reserved", c_uint32 * 2)
     ]
 
-class Stats(Structure):
-    """统计信息结构体（对应 C 中的 stats）"""
-    _fields_ = [
-        ("frames_received", c_uint32),
-        ("bytes_received", c_uint32),
-        ("start_time", ctypes.c_uint64),
-        ("last_frame_time", ctypes.c_uint64),
-        ("avg_fps", ctypes.c_double)
-    ]
+assert ctypes.sizeof(FrameHeader) == FRAME_HEADER_SIZE
+
+# client_config.flags 位定义（对应 C 中的 CONFIG_*）
+CONFIG_ENABLE_SAVE = 1 << 0
+CONFIG_ENABLE_CONVERSION = 1 << 1
+CONFIG_USE_IO_URING = 1 << 2
+
+def _flag_property(bit: int, doc: str) -> property:
+    """把 flags 中的一位暴露为可读写的布尔属性"""
+    def getter(self) -> bool:
+        return bool(self.flags & bit)
+    
+    def setter(self, value):
+        if value:
+            self.flags |= bit
+        else:
+            self.flags &= ~bit
+    
+    return property(getter, setter, doc=doc)
+
+# 逐帧数据回调（对应 C 中的 frame_cb_t）：帧头、原始负载地址、负载字节数
+FrameCallback = ctypes.CFUNCTYPE(None, POINTER(FrameHeader), c_void_p, ctypes.c_size_t)
 
 class ClientConfig(Structure):
     """客户端配置结构体（对应 C 中的 client_config）"""
@@ -92,11 +201,30 @@ class ClientConfig(Structure):
         ("server_ip", c_char_p),
         ("port", c_int),
         ("output_dir", c_char_p),
-        ("enable_conversion", c_int),
-        ("save_interval", c_int),
-        ("enable_save", c_int)
+        ("flags", c_uint32),
+        ("save_interval", ctypes.c_uint16),
+        ("_reserved", ctypes.c_uint16),
+        ("on_frame", FrameCallback)
+    ]
+    
+    enable_save = _flag_property(CONFIG_ENABLE_SAVE, "是否启用文件保存")
+    enable_conversion = _flag_property(CONFIG_ENABLE_CONVERSION, "是否启用SBGGR10转换")
+    use_io_uring = _flag_property(CONFIG_USE_IO_URING, "是否使用io_uring接收")
+
+class Snapshot(Structure):
+    """状态快照结构体（对应 C 中的 snapshot）"""
+    _fields_ = [
+        ("frames_received", ctypes.c_uint64),
+        ("bytes_received", ctypes.c_uint64),
+        ("avg_fps", ctypes.c_double),
+        ("frame_seq", ctypes.c_uint64),
+        ("frame", POINTER(ctypes.c_uint16)),
+        ("frame_pixels", ctypes.c_size_t)
     ]
 
+# 帧就绪回调（对应 C 中的 frame_ready_cb_t）
+FrameReadyCallback = ctypes.CFUNCTYPE(None, c_uint32)
+
 class V4L2Client:
     """V4L2 客户端 C 库接口封装"""
     
@@ -105,38 +233,28 @@ class V4L2Client:
         self.config = None
         self.sock_fd = None
         self.frame_buffer = None
+        self.verbose = False  # 是否打印 RAW 图像统计（最多每 STATS_LOG_INTERVAL 秒一次）
+        self._last_stats_log = 0.0
+        self._last_seq = 0  # 上次处理过的 C 侧帧序号
+        # 帧就绪事件：C 接收线程每处理完一帧通过回调置位
+        self._frame_ready = threading.Event()
+        self._frame_ready_cb = FrameReadyCallback(self._on_frame_ready)  # 保持引用，防止被回收
+        self._snapshot = Snapshot()  # get_snapshot 的输出结构体，复用
+        self._heatmap_lut = build_heatmap_lut()
+        # 对比度拉伸查找表：uint16 -> uint8，拉伸范围稳定时跨帧复用
+        self._contrast_lut = np.empty(65536, dtype=np.uint8)
+        self._contrast_lut_range: Optional[Tuple[int, int]] = None  # None 表示查找表尚未生成
+        self.allocate_display_buffers(DEFAULT_HEIGHT, DEFAULT_WIDTH)
         self.load_library()
     
     def load_library(self):
         """加载 C 动态库"""
         try:
-            # 根据平台选择库文件
-            if sys.platform == "win32":
-                lib_name = "libv4l2_usb_pc.dll"
-            elif sys.platform == "darwin":
-                lib_name = "libv4l2_usb_pc.dylib"
-            else:
-                lib_name = "libv4l2_usb_pc.so"
-            
-            # 查找库文件路径
-            lib_paths = [
-                os.path.join(os.path.dirname(__file__), lib_name),
-                os.path.join(os.path.dirname(__file__), "..", "source_all_platform", "build_native", "dist", f"linux_x86_64", "lib", lib_name),
-                os.path.join(os.path.dirname(__file__), "..", "source_all_platform", "lib", lib_name),
-                lib_name  # 系统路径
-            ]
-            
-            for lib_path in lib_paths:
-                if os.path.exists(lib_path):
-                    self.lib = ctypes.CDLL(lib_path)
-                    break
-            
-            if not self.lib:
-                raise FileNotFoundError(f"找不到 C 库文件: {lib_name}")
+            self.lib = _open_lib()
             
             # 定义函数原型
             self.setup_function_prototypes()
-            print(f"成功加载 C 库: {lib_name}")
+            print(f"成功加载 C 库: {LIB_NAME}")
             
         except Exception as e:
             print(f"加载 C 库失败: {e}")
@@ -166,6 +284,10 @@ class V4L2Client:
         self.lib.create_output_dir.argtypes = [c_char_p]
         self.lib.create_output_dir.restype = c_int
         
+        # cancel_receive(sock)
+        self.lib.cancel_receive.argtypes = [c_int]
+        self.lib.cancel_receive.restype = None
+        
         # receive_loop(sock, config)
         self.lib.receive_loop.argtypes = [c_int, POINTER(ClientConfig)]
         self.lib.receive_loop.restype = c_int
@@ -178,22 +300,25 @@ class V4L2Client:
         self.lib.cleanup_memory_pool.argtypes = []
         self.lib.cleanup_memory_pool.restype = None
         
-        # 获取全局统计信息（需要通过指针访问）
-        try:
-            self.stats_ptr = ctypes.cast(self.lib.stats, POINTER(Stats))
-        except:
-            self.stats_ptr = None
+        # pool_enable_hugepages(slot_bytes)
+        self.lib.pool_enable_hugepages.argtypes = [ctypes.c_size_t]
+        self.lib.pool_enable_hugepages.restype = c_int
         
-        # 获取全局解包缓冲区访问
+        # set_frame_ready_cb(cb)
         try:
-            # g_unpack_buffer 和 g_buffer_size 的访问
-            self.g_unpack_buffer_ptr = ctypes.cast(self.lib.g_unpack_buffer, POINTER(ctypes.POINTER(ctypes.c_uint16)))
-            self.g_buffer_size_ptr = ctypes.cast(self.lib.g_buffer_size, POINTER(ctypes.c_size_t))
-            print("✅ 成功访问全局解包缓冲区")
-        except Exception as e:
-            print(f"⚠️  无法访问全局解包缓冲区: {e}")
-            self.g_unpack_buffer_ptr = None
-            self.g_buffer_size_ptr = None
+            self.lib.set_frame_ready_cb.argtypes = [FrameReadyCallback]
+            self.lib.set_frame_ready_cb.restype = None
+            self.lib.set_frame_ready_cb(self._frame_ready_cb)
+        except AttributeError:
+            print("⚠️  C 库不支持帧就绪回调，将按固定间隔轮询")
+        
+        # get_snapshot(out)：一次调用取回统计信息和最新帧位置
+        self.lib.get_snapshot.argtypes = [POINTER(Snapshot)]
+        self.lib.get_snapshot.restype = None
+        
+        # get_frame_seq()：处理完快照中的槽后确认其未被重写
+        self.lib.get_frame_seq.argtypes = []
+        self.lib.get_frame_seq.restype = ctypes.c_uint64
     
     def create_client(self, server_ip: str, port: int, save_path: Optional[str] = None):
         """创建客户端"""
@@ -205,8 +330,9 @@ class V4L2Client:
             print("网络初始化失败")
             return False
         
-        # 初始化内存池
+        # 初始化内存池，并按预期帧大小迁移到透明大页（不支持时保留原内存池）
         self.lib.init_memory_pool()
+        self.lib.pool_enable_hugepages(DEFAULT_WIDTH * DEFAULT_HEIGHT * 2)
         
         # 配置客户端
         self.config = ClientConfig()
@@ -230,6 +356,9 @@ class V4L2Client:
         if not self.lib or not self.config:
             return False
         
+        # 上一次 stop() 清除了全局运行标志，重新开始前恢复
+        c_int.in_dll(self.lib, "running").value = 1
+        
         # 连接到服务器
         self.sock_fd = self.lib.connect_to_server(self.config.server_ip, self.config.port)
         if self.sock_fd < 0:
@@ -241,20 +370,32 @@ class V4L2Client:
     
     def stop(self):
         """停止接收"""
-        # 设置全局运行标志为停止
-        if self.lib:
-            try:
-                # 通过访问 running 变量来停止
-                running_ptr = ctypes.cast(self.lib.running, POINTER(c_int))
-                running_ptr.contents = c_int(0)
-            except:
-                pass
+        # cancel_receive 清除全局运行标志并关闭套接字读写方向，阻塞在 recv() 中的接收线程立即返回
+        if self.lib and self.sock_fd is not None:
+            self.lib.cancel_receive(self.sock_fd)
+        
+        # 唤醒等待新帧的线程
+        self._frame_ready.set()
+    
+    def _on_frame_ready(self, frame_id):
+        """C 接收线程的帧就绪回调"""
+        self._frame_ready.set()
+    
+    def wait_frame(self, timeout: float) -> bool:
+        """等待下一帧就绪，超时返回 False"""
+        ready = self._frame_ready.wait(timeout)
+        self._frame_ready.clear()
+        return ready
     
     def destroy(self):
         """销毁客户端"""
         if not self.lib:
             return
         
+        # 注销帧就绪回调
+        if hasattr(self.lib, "set_frame_ready_cb"):
+            self.lib.set_frame_ready_cb(FrameReadyCallback())  # 空指针
+        
         # 清理内存池
         self.lib.cleanup_memory_pool()
         
@@ -264,96 +405,183 @@ class V4L2Client:
         self.config = None
         self.sock_fd = None
     
-    def get_frame(self) -> Optional[np.ndarray]:
-        """获取最新的 16-bit 图像数据"""
-        if not self.lib or not self.g_unpack_buffer_ptr or not self.g_buffer_size_ptr:
+    def take_snapshot(self) -> Optional[Snapshot]:
+        """一次 ctypes 调用取回统计信息和最新帧位置，供 get_info/get_frame 共用"""
+        if not self.lib:
             return None
         
+        self.lib.get_snapshot(ctypes.byref(self._snapshot))
+        return self._snapshot
+    
+    def _latest_image(self, snapshot: Optional[Snapshot]) -> Optional[np.ndarray]:
+        """返回快照中尚未处理过的 16-bit 图像（C 缓冲区的零拷贝视图），没有新帧时返回 None"""
+        if snapshot is None:
+            snapshot = self.take_snapshot()
+        if snapshot is None:
+            return None
+        
+        # 没有新帧发布时直接返回，避免重复做统计和转换
+        if snapshot.frame_seq == self._last_seq or not snapshot.frame:
+            return None
+        
+        # 假设图像是 DEFAULT_WIDTH x DEFAULT_HEIGHT 的 16-bit 数据
+        expected_pixels = DEFAULT_WIDTH * DEFAULT_HEIGHT
+        if snapshot.frame_pixels < expected_pixels:
+            return None
+        
+        # 直接把已完成的槽包装为 numpy 数组（零拷贝）
+        # 接收线程再发布两帧之后才会重写该槽，处理完用 _slot_overwritten() 确认
+        self._last_seq = snapshot.frame_seq
+        return np.ctypeslib.as_array(snapshot.frame, shape=(DEFAULT_HEIGHT, DEFAULT_WIDTH))
+    
+    def _slot_overwritten(self) -> bool:
+        """_latest_image 返回的槽在处理期间是否可能已被接收线程重写（是则丢弃该帧）"""
+        return self.lib.get_frame_seq() - self._last_seq >= UNPACK_SLOT_COUNT - 1
+    
+    def get_frame(self, snapshot: Optional[Snapshot] = None) -> Optional[np.ndarray]:
+        """获取最新的 16-bit 图像数据"""
         try:
-            # 获取缓冲区指针和大小
-            buffer_ptr = self.g_unpack_buffer_ptr.contents
-            buffer_size = self.g_buffer_size_ptr.contents.value
-            
-            if not buffer_ptr or buffer_size == 0:
+            image_16bit = self._latest_image(snapshot)
+            if image_16bit is None:
                 return None
             
-            # 将 C 缓冲区数据复制到 numpy 数组
-            # 假设图像是 DEFAULT_WIDTH x DEFAULT_HEIGHT 的 16-bit 数据
-            expected_pixels = DEFAULT_WIDTH * DEFAULT_HEIGHT
-            if buffer_size < expected_pixels:
+            # 转换为显示格式（8-bit RGB）
+            # 显示转换会生成新的 8-bit 图像，GUI 不会持有对 C 缓冲区的引用
+            display = self.convert_16bit_to_display(image_16bit)
+            if self._slot_overwritten():
                 return None
+            # 转换结果在预分配缓冲区中，下一帧会被重写；交给界面线程的必须是独立的副本
+            return display.copy()
             
-            # 创建 numpy 数组从 C 缓冲区
-            c_array = ctypes.cast(buffer_ptr, ctypes.POINTER(ctypes.c_uint16 * expected_pixels))
-            raw_data = np.frombuffer(c_array.contents, dtype=np.uint16).copy()
+        except Exception as e:
+            print(f"获取帧数据失败: {e}")
+            return None
+    
+    def get_raw_frame(self, snapshot: Optional[Snapshot] = None) -> Optional[tuple]:
+        """获取最新的 16-bit 图像及其拉伸范围 (image, p1, p99)，供 GPU 显示路径使用"""
+        try:
+            image_16bit = self._latest_image(snapshot)
+            if image_16bit is None:
+                return None
             
-            # 重塑为图像形状
-            image_16bit = raw_data[:expected_pixels].reshape((DEFAULT_HEIGHT, DEFAULT_WIDTH))
+            # 复制为独立数组（唯一的一次复制），交给界面线程后 C 侧可以继续写槽
+            raw = image_16bit.copy()
+            if self._slot_overwritten():
+                return None
             
-            # 转换为显示格式（8-bit RGB）
-            return self.convert_16bit_to_display(image_16bit)
+            p1, p99 = self.compute_stretch_range(raw)
+            return raw, p1, p99
             
         except Exception as e:
             print(f"获取帧数据失败: {e}")
             return None
     
-    def convert_16bit_to_display(self, image_16bit: np.ndarray) -> np.ndarray:
-        """将 16-bit RAW 图像转换为显示用的 8-bit RGB 图像 (类似 ImageJ)"""
-        # 统计信息
-        min_val = np.min(image_16bit)
-        max_val = np.max(image_16bit)
-        mean_val = np.mean(image_16bit)
-        std_val = np.std(image_16bit)
-        
-        print(f"RAW 图像统计: Min={min_val}, Max={max_val}, Mean={mean_val:.1f}, Std={std_val:.1f}")
+    def allocate_display_buffers(self, height: int, width: int):
+        """预分配显示转换用的缓冲区，每帧复用，避免反复分配大数组"""
+        self._display_shape = (height, width)
+        self._clip_buf = np.empty((height, width), dtype=np.uint16)
+        # 转换输出的暂存缓冲区，只在接收线程内使用；get_frame 返回前复制
+        self._gray_buf = np.empty((height, width), dtype=np.uint8)
+        self._rgb_buf = np.empty((height, width, 3), dtype=np.uint8)
+    
+    def compute_stretch_range(self, image_16bit: np.ndarray) -> tuple:
+        """计算自动对比度拉伸范围 (p1, p99)"""
+        # 统计信息：只遍历一次图像建立直方图，其余统计量都从直方图推导
+        hist = np.bincount(image_16bit.ravel(), minlength=65536)
+        nonzero_bins = np.flatnonzero(hist)
+        min_val = int(nonzero_bins[0])
+        max_val = int(nonzero_bins[-1])
+        cdf = np.cumsum(hist)
+        total = int(cdf[-1])
+        
+        if self.verbose and time.monotonic() - self._last_stats_log >= STATS_LOG_INTERVAL:
+            self._last_stats_log = time.monotonic()
+            levels = np.arange(len(hist), dtype=np.float64)
+            mean_val = float(hist @ levels) / total
+            std_val = np.sqrt(max(float(hist @ (levels * levels)) / total - mean_val * mean_val, 0.0))
+            print(f"RAW 图像统计: Min={min_val}, Max={max_val}, Mean={mean_val:.1f}, Std={std_val:.1f}")
         
         if max_val == min_val:
-            # 如果图像没有动态范围，返回黑色图像
-            normalized = np.zeros_like(image_16bit, dtype=np.uint8)
+            # 如果图像没有动态范围，拉伸结果全黑
+            p1 = p99 = min_val
         else:
-            # 自动对比度调整：使用 1% 和 99% 分位数进行拉伸
-            p1 = np.percentile(image_16bit, 1)
-            p99 = np.percentile(image_16bit, 99)
+            # 自动对比度调整：使用 1% 和 99% 分位数进行拉伸（由累积直方图查得）
+            p1, p99 = (int(v) for v in np.searchsorted(cdf, [0.01 * total, 0.99 * total]))
             
-            if p99 > p1:
-                # 裁剪到分位数范围并拉伸
-                clipped = np.clip(image_16bit, p1, p99)
-                normalized = ((clipped - p1) / (p99 - p1) * 255).astype(np.uint8)
-            else:
+            if p99 <= p1:
                 # 使用全范围拉伸
-                normalized = ((image_16bit - min_val) / (max_val - min_val) * 255).astype(np.uint8)
+                p1, p99 = min_val, max_val
         
-        # 可选：应用伪彩色映射
-        if hasattr(self, 'use_false_color') and self.use_false_color:
-            return self.apply_false_color(normalized)
+        return p1, p99
+    
+    def convert_16bit_to_display(self, image_16bit: np.ndarray) -> np.ndarray:
+        """将 16-bit RAW 图像转换为显示用的 8-bit 图像 (类似 ImageJ)
+        
+        灰度模式返回 (H, W) 单通道图像，伪彩色模式返回 (H, W, 3) RGB 图像。
+        """
+        if image_16bit.shape != self._display_shape:
+            self.allocate_display_buffers(*image_16bit.shape)
+        
+        p1, p99 = self.compute_stretch_range(image_16bit)
+        
+        normalized = self._gray_buf
+        use_false_color = hasattr(self, 'use_false_color') and self.use_false_color
+        if use_false_color:
+            rgb_image = self._rgb_buf
+        
+        if numba is not None:
+            # 裁剪、拉伸和颜色映射在一个 JIT 内核中完成
+            if use_false_color:
+                _stretch_false_color_kernel(image_16bit, p1, p99, rgb_image)
+                return rgb_image
+            _stretch_gray_kernel(image_16bit, p1, p99, normalized)
+            return normalized
+        
+        if p99 == p1:
+            normalized.fill(0)
+        elif cv2 is not None:
+            # OpenCV SIMD 实现：饱和减法去掉 p1 以下部分，缩放时饱和截断 p99 以上部分
+            shifted = cv2.subtract(image_16bit, p1, dst=self._clip_buf)
+            cv2.convertScaleAbs(shifted, dst=normalized, alpha=255.0 / (p99 - p1))
         else:
-            # 灰度 RGB
-            rgb_image = np.stack([normalized, normalized, normalized], axis=2)
-            return rgb_image
+            # 通过 65536 项查找表一次完成裁剪和拉伸
+            lut = self.get_contrast_lut(p1, p99)
+            np.take(lut, image_16bit, out=normalized)
+        
+        # 可选：应用伪彩色映射；灰度图直接交给 Qt 以 Grayscale8 显示
+        if use_false_color:
+            return self.apply_false_color(normalized, rgb_image)
+        return normalized
+    
+    def get_contrast_lut(self, p1: int, p99: int) -> np.ndarray:
+        """返回 uint16 -> uint8 的对比度拉伸查找表，拉伸范围变化明显时才重建"""
+        lut_range = self._contrast_lut_range
+        if (lut_range is None
+                or abs(p1 - lut_range[0]) > CONTRAST_LUT_TOLERANCE
+                or abs(p99 - lut_range[1]) > CONTRAST_LUT_TOLERANCE):
+            levels = np.arange(65536, dtype=np.float64)
+            np.clip((levels - p1) * (255.0 / (p99 - p1)), 0, 255, out=levels)
+            self._contrast_lut[:] = levels
+            self._contrast_lut_range = (p1, p99)
+        return self._contrast_lut
     
-    def apply_false_color(self, gray_image: np.ndarray) -> np.ndarray:
+    def apply_false_color(self, gray_image: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
         """应用伪彩色映射 (热图风格)"""
-        # 简单的热图映射
-        rgb_image = np.zeros((gray_image.shape[0], gray_image.shape[1], 3), dtype=np.uint8)
-        
-        # 红色通道
-        rgb_image[:, :, 0] = np.clip(gray_image * 1.5 - 128, 0, 255).astype(np.uint8)
-        
-        # 绿色通道
-        rgb_image[:, :, 1] = np.clip(np.abs(gray_image - 128) * 2, 0, 255).astype(np.uint8)
-        
-        # 蓝色通道
-        rgb_image[:, :, 2] = np.clip(255 - gray_image * 1.5, 0, 255).astype(np.uint8)
-        
-        return rgb_image
+        # 查表映射：一次查表完成三个通道
+        if out is None:
+            out = np.empty((gray_image.shape[0], gray_image.shape[1], 3), dtype=np.uint8)
+        np.take(self._heatmap_lut, gray_image, axis=0, out=out)
+        return out
     
-    def get_info(self) -> Optional[FrameInfo]:
+    def get_info(self, snapshot: Optional[Snapshot] = None) -> Optional[FrameInfo]:
         """获取帧信息"""
-        if not self.lib or not self.stats_ptr:
+        if snapshot is None:
+            snapshot = self.take_snapshot()
+        if snapshot is None:
             return None
         
         try:
-            stats = self.stats_ptr.contents
+            stats = snapshot
             # 创建帧信息对象
             info = FrameInfo()
             info.frame_id = stats.frames_received
@@ -386,6 +614,10 @@ class MockDataGenerator:
         self.frame_count = 0
         self.start_time = time.time()
         self.running = False
+        
+        # 预先生成坐标向量，用于广播生成图案
+        self._xs = np.arange(DEFAULT_WIDTH, dtype=np.int32)
+        self._ys = np.arange(DEFAULT_HEIGHT, dtype=np.int32)[:, None]
     
     def create_client(self, server_ip: str, port: int, save_path: Optional[str] = None):
         """模拟创建客户端"""
@@ -412,18 +644,17 @@ class MockDataGenerator:
             return None
         
         # 生成简单的渐变图像
-        frame = np.zeros((DEFAULT_HEIGHT, DEFAULT_WIDTH, 3), dtype=np.uint8)
+        frame = np.empty((DEFAULT_HEIGHT, DEFAULT_WIDTH, 3), dtype=np.uint8)
         
         # 创建时间相关的动画效果
         t = time.time() - self.start_time
         offset = int(t * 50) % 256
         
-        # 生成渐变图案
-        for y in range(DEFAULT_HEIGHT):
-            for x in range(DEFAULT_WIDTH):
-                frame[y, x, 0] = (x + offset) % 256  # Red
-                frame[y, x, 1] = (y + offset) % 256  # Green
-                frame[y, x, 2] = ((x + y + offset) // 2) % 256  # Blue
+        # 生成渐变图案（行/列坐标广播到整幅图像）
+        xs, ys = self._xs, self._ys
+        frame[:, :, 0] = (xs + offset) & 0xFF  # Red
+        frame[:, :, 1] = (ys + offset) & 0xFF  # Green
+        frame[:, :, 2] = ((xs + ys + offset) // 2) & 0xFF  # Blue
         
         self.frame_count += 1
         return frame
@@ -453,16 +684,23 @@ class DataReceiver(QThread):
     """数据接收线程"""
     
     frame_updated = Signal(np.ndarray)     # 新帧数据
+    raw_frame_updated = Signal(object)     # 新 16-bit 帧 (image, p1, p99)，GPU 显示时使用
     info_updated = Signal(object)          # 帧信息更新
     error_occurred = Signal(str)           # 错误信息
     
-    def __init__(self, server_ip: str, port: int, save_path: Optional[str] = None):
+    def __init__(self, server_ip: str, port: int, save_path: Optional[str] = None,
+                 gpu_display: bool = False):
         super().__init__()
         self.server_ip = server_ip
         self.port = port
         self.save_path = save_path
+        self.gpu_display = gpu_display
         self.running = False
         
+        # 演示图像的坐标向量
+        self._xs = np.arange(DEFAULT_WIDTH, dtype=np.int32)
+        self._ys = np.arange(DEFAULT_HEIGHT, dtype=np.int32)[:, None]
+        
         # 使用类似 test_client.py 的方式
         self.client = V4L2Client()
         
@@ -487,6 +725,7 @@ class DataReceiver(QThread):
     
     def run(self):
         """主循环"""
+        c_thread = None
         try:
             # 创建客户端连接
             if not self.client.create_client(self.server_ip, self.port, self.save_path):
@@ -517,23 +756,33 @@ class DataReceiver(QThread):
                 
                 # 主循环：监控统计信息并获取真实图像
                 while self.running:
+                    # 每轮只取一次快照，统计信息和图像共用
+                    snapshot = self.client.take_snapshot()
+                    
                     # 获取统计信息
-                    info = self.client.get_info()
+                    info = self.client.get_info(snapshot)
                     if info is not None:
                         self.info_updated.emit(info)
                         
                         # 尝试获取真实的 16-bit 图像数据
-                        frame = self.client.get_frame()
-                        if frame is not None:
-                            self.frame_updated.emit(frame)
+                        # GPU 显示时只交出 RAW 图像和拉伸范围，颜色转换由着色器完成
+                        if self.gpu_display:
+                            frame = self.client.get_raw_frame(snapshot)
+                            signal = self.raw_frame_updated
                         else:
-                            # 如果无法获取真实数据，生成状态显示图像
+                            frame = self.client.get_frame(snapshot)
+                            signal = self.frame_updated
+                        
+                        if frame is not None:
+                            signal.emit(frame)
+                        elif not snapshot.frame:
+                            # 还没有解包帧可显示时，生成状态显示图像
                             demo_frame = self.generate_demo_frame(info)
                             if demo_frame is not None:
                                 self.frame_updated.emit(demo_frame)
                     
-                    # 控制更新频率
-                    self.msleep(100)  # 10 FPS for GUI updates
+                    # 等待 C 侧的帧就绪通知；超时后仍刷新一次统计信息
+                    self.client.wait_frame(0.1)
                 
             else:
                 # 使用模拟器的接收循环
@@ -555,25 +804,27 @@ class DataReceiver(QThread):
             self.error_occurred.emit(f"接收线程错误: {e}")
         
         finally:
+            if c_thread is not None:
+                # C 接收线程可能仍在解包写内存池；先让它退出并等待结束，再释放内存池
+                self.client.stop()
+                c_thread.join()
             if self.client:
                 self.client.destroy()
     
     def generate_demo_frame(self, info: FrameInfo) -> Optional[np.ndarray]:
         """生成演示图像（显示接收状态）"""
         # 创建一个简单的状态显示图像
-        frame = np.zeros((DEFAULT_HEIGHT, DEFAULT_WIDTH, 3), dtype=np.uint8)
+        frame = np.empty((DEFAULT_HEIGHT, DEFAULT_WIDTH, 3), dtype=np.uint8)
         
         # 创建动态效果
         t = time.time()
         offset = int(t * 30) % 256
         
-        # 背景渐变
-        for y in range(DEFAULT_HEIGHT):
-            for x in range(DEFAULT_WIDTH):
-                # 创建基于统计信息的视觉效果
-                frame[y, x, 0] = (x + info.frame_id + offset) % 256  # Red
-                frame[y, x, 1] = (y + info.total_frames // 10) % 256  # Green  
-                frame[y, x, 2] = ((x + y + info.fps * 2) // 2 + offset) % 256  # Blue
+        # 背景渐变（基于统计信息的视觉效果，行/列坐标广播到整幅图像）
+        xs, ys = self._xs, self._ys
+        frame[:, :, 0] = (xs + (info.frame_id + offset) % 256) & 0xFF  # Red
+        frame[:, :, 1] = (ys + (info.total_frames // 10) % 256) & 0xFF  # Green
+        frame[:, :, 2] = ((xs + ys + info.fps * 2) // 2 + offset) & 0xFF  # Blue
         
         # 添加文本信息区域（简单的亮度变化表示）
         # 在图像上部添加状态条
@@ -582,16 +833,216 @@ class DataReceiver(QThread):
         
         return frame
 
+# ========================== OpenGL 显示控件 ==========================
+
+_GL_COLOR_BUFFER_BIT = 0x00004000
+_GL_TRIANGLE_STRIP = 0x0005
+
+# 全屏四边形：由 gl_VertexID 生成顶点，无需顶点缓冲区
+_GL_VERTEX_SHADER = """
+#version 330 core
+out vec2 v_uv;
+void main() {
+    vec2 pos = vec2(float(gl_VertexID & 1), float(gl_VertexID >> 1)) * 2.0 - 1.0;
+    v_uv = vec2(pos.x + 1.0, 1.0 - pos.y) * 0.5;
+    gl_Position = vec4(pos, 0.0, 1.0);
+}
+"""
+
+# 对比度拉伸 + 灰度/伪彩色映射，与 CPU 路径的 convert_16bit_to_display 对应
+_GL_FRAGMENT_SHADER = """
+#version 330 core
+in vec2 v_uv;
+out vec4 frag_color;
+uniform sampler2D u_raw;   // 16-bit RAW，R16 归一化纹理
+uniform sampler2D u_rgb;   // 8-bit RGB（演示/状态图像）
+uniform sampler2D u_lut;   // 256x1 伪彩色查找表
+uniform float u_p1;
+uniform float u_p99;
+uniform int u_mode;
+void main() {
+    if (u_mode == 2) {
+        frag_color = vec4(texture(u_rgb, v_uv).rgb, 1.0);
+        return;
+    }
+    float v = texture(u_raw, v_uv).r * 65535.0;
+    float n = u_p99 > u_p1 ? clamp((v - u_p1) / (u_p99 - u_p1), 0.0, 1.0) : 0.0;
+    if (u_mode == 1) {
+        frag_color = vec4(texture(u_lut, vec2((n * 255.0 + 0.5) / 256.0, 0.5)).rgb, 1.0);
+    } else {
+        frag_color = vec4(n, n, n, 1.0);
+    }
+}
+"""
+
+if QOpenGLWidget is not None:
+    class GLImageView(QOpenGLWidget):
+        """OpenGL 图像显示控件：16-bit RAW 作为纹理上传，拉伸和颜色映射在片段着色器中完成"""
+        
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            self._program = None
+            self._vao = None
+            self._transfer = None
+            self._raw_tex = None
+            self._rgb_tex = None
+            self._lut_tex = None
+            self._pending = None        # 待上传的 (mode, image, p1, p99)
+            self._mode = GL_MODE_GRAY
+            self._p1 = 0.0
+            self._p99 = 0.0
+            self._image_size = None     # (width, height)
+            self._false_color = False
+        
+        def set_raw_frame(self, image_16bit: np.ndarray, p1: int, p99: int):
+            """提交 16-bit 图像，下一次重绘时上传"""
+            self._pending = (GL_MODE_GRAY, image_16bit, p1, p99)
+            self.update()
+        
+        def set_rgb_frame(self, rgb_image: np.ndarray):
+            """提交 8-bit RGB 图像（演示/状态图像），下一次重绘时上传"""
+            self._pending = (GL_MODE_RGB, rgb_image, 0, 0)
+            self.update()
+        
+        def set_false_color(self, enabled: bool):
+            """切换伪彩色，只改变着色器参数"""
+            self._false_color = enabled
+            self.update()
+        
+        def initializeGL(self):
+            self._program = QOpenGLShaderProgram(self)
+            self._program.addShaderFromSourceCode(QOpenGLShader.Vertex, _GL_VERTEX_SHADER)
+            self._program.addShaderFromSourceCode(QOpenGLShader.Fragment, _GL_FRAGMENT_SHADER)
+            if not self._program.link():
+                print(f"着色器链接失败: {self._program.log()}")
+            
+            self._vao = QOpenGLVertexArrayObject(self)
+            self._vao.create()
+            
+            # 行宽不一定是 4 字节对齐（RGB888）
+            self._transfer = QOpenGLPixelTransferOptions()
+            self._transfer.setAlignment(1)
+            
+            lut = np.ascontiguousarray(build_heatmap_lut())
+            self._lut_tex = self._create_texture(
+                256, 1, QOpenGLTexture.RGB8_UNorm, QOpenGLTexture.RGB,
+                QOpenGLTexture.UInt8, QOpenGLTexture.Nearest
+            )
+            self._lut_tex.setData(QOpenGLTexture.RGB, QOpenGLTexture.UInt8, lut.ctypes.data, self._transfer)
+            
+            self.context().aboutToBeDestroyed.connect(self._cleanup_gl)
+        
+        def _create_texture(self, width, height, texture_format, pixel_format, pixel_type, filter_mode):
+            """创建并分配二维纹理"""
+            texture = QOpenGLTexture(QOpenGLTexture.Target2D)
+            texture.setFormat(texture_format)
+            texture.setSize(width, height)
+            texture.setMinMagFilters(filter_mode, filter_mode)
+            texture.setWrapMode(QOpenGLTexture.ClampToEdge)
+            texture.allocateStorage(pixel_format, pixel_type)
+            return texture
+        
+        def _upload_pending(self):
+            """把待显示的图像上传为纹理（尺寸不变时只更新数据）"""
+            mode, image, p1, p99 = self._pending
+            self._pending = None
+            height, width = image.shape[:2]
+            
+            if mode == GL_MODE_RGB:
+                texture_format, pixel_format, pixel_type = (
+                    QOpenGLTexture.RGB8_UNorm, QOpenGLTexture.RGB, QOpenGLTexture.UInt8)
+                texture = self._rgb_tex
+            else:
+                texture_format, pixel_format, pixel_type = (
+                    QOpenGLTexture.R16_UNorm, QOpenGLTexture.Red, QOpenGLTexture.UInt16)
+                texture = self._raw_tex
+            
+            if texture is None or (texture.width(), texture.height()) != (width, height):
+                if texture is not None:
+                    texture.destroy()
+                texture = self._create_texture(
+                    width, height, texture_format, pixel_format, pixel_type, QOpenGLTexture.Linear)
+            
+            image = np.ascontiguousarray(image)
+            texture.setData(pixel_format, pixel_type, image.ctypes.data, self._transfer)
+            
+            if mode == GL_MODE_RGB:
+                self._rgb_tex = texture
+            else:
+                self._raw_tex = texture
+            self._mode = mode
+            self._p1 = float(p1)
+            self._p99 = float(p99)
+            self._image_size = (width, height)
+        
+        def paintGL(self):
+            gl = self.context().functions()
+            gl.glClearColor(0.0, 0.0, 0.0, 1.0)
+            gl.glClear(_GL_COLOR_BUFFER_BIT)
+            
+            if self._pending is not None:
+                self._upload_pending()
+            if self._image_size is None or not self._program.isLinked():
+                return
+            
+            # 保持宽高比居中显示
+            ratio = self.devicePixelRatio()
+            view_width = int(self.width() * ratio)
+            view_height = int(self.height() * ratio)
+            image_width, image_height = self._image_size
+            scale = min(view_width / image_width, view_height / image_height)
+            width = int(image_width * scale)
+            height = int(image_height * scale)
+            gl.glViewport((view_width - width) // 2, (view_height - height) // 2, width, height)
+            
+            mode = self._mode
+            if mode == GL_MODE_GRAY and self._false_color:
+                mode = GL_MODE_FALSE_COLOR
+            
+            self._program.bind()
+            if self._raw_tex is not None:
+                self._raw_tex.bind(0)
+            if self._rgb_tex is not None:
+                self._rgb_tex.bind(1)
+            self._lut_tex.bind(2)
+            self._program.setUniformValue1i("u_raw", 0)
+            self._program.setUniformValue1i("u_rgb", 1)
+            self._program.setUniformValue1i("u_lut", 2)
+            self._program.setUniformValue1f("u_p1", self._p1)
+            self._program.setUniformValue1f("u_p99", self._p99)
+            self._program.setUniformValue1i("u_mode", mode)
+            
+            self._vao.bind()
+            gl.glDrawArrays(_GL_TRIANGLE_STRIP, 0, 4)
+            self._vao.release()
+            self._program.release()
+        
+        def _cleanup_gl(self):
+            """上下文销毁前释放纹理"""
+            self.makeCurrent()
+            for texture in (self._raw_tex, self._rgb_tex, self._lut_tex):
+                if texture is not None:
+                    texture.destroy()
+            self._raw_tex = self._rgb_tex = self._lut_tex = None
+            if self._vao is not None:
+                self._vao.destroy()
+            self.doneCurrent()
+else:
+    GLImageView = None
+
 # ========================== 主窗口类 ==========================
 
 class MainWindow(QMainWindow):
     """主窗口类"""
     
-    def __init__(self):
+    def __init__(self, use_gpu: bool = False):
         super().__init__()
         self.receiver = None
         self.current_frame = None
+        self.current_raw = None  # GPU 显示路径：(image_16bit, p1, p99)
         self.use_false_color = False  # 初始化显示模式
+        # GPU 显示：拉伸和颜色映射在 OpenGL 着色器中完成
+        self.gl_view = GLImageView() if use_gpu and GLImageView is not None else None
         self.init_ui()
         self.setup_timer()
     
@@ -701,7 +1152,11 @@ class MainWindow(QMainWindow):
         self.image_label.setText("等待连接...")
         self.image_label.setScaledContents(True)
         
-        layout.addWidget(self.image_label)
+        if self.gl_view is not None:
+            self.gl_view.setMinimumSize(640, 360)
+            layout.addWidget(self.gl_view)
+        else:
+            layout.addWidget(self.image_label)
         return panel
     
     def create_info_panel(self) -> QWidget:
@@ -768,6 +1223,9 @@ class MainWindow(QMainWindow):
                 self.gray_mode_btn.setChecked(False)
                 self.use_false_color = True
         
+        if self.gl_view is not None:
+            self.gl_view.set_false_color(self.use_false_color)
+        
         # 如果当前有接收器在运行，更新其显示模式
         if self.receiver and hasattr(self.receiver.client, 'use_false_color'):
             self.receiver.client.use_false_color = getattr(self, 'use_false_color', False)
@@ -791,8 +1249,9 @@ class MainWindow(QMainWindow):
             return
         
         # 创建接收线程
-        self.receiver = DataReceiver(server_ip, port, save_path)
+        self.receiver = DataReceiver(server_ip, port, save_path, gpu_display=self.gl_view is not None)
         self.receiver.frame_updated.connect(self.on_frame_received)
+        self.receiver.raw_frame_updated.connect(self.on_raw_frame_received)
         self.receiver.info_updated.connect(self.on_info_updated)
         self.receiver.error_occurred.connect(self.on_error_occurred)
         
@@ -824,7 +1283,12 @@ class MainWindow(QMainWindow):
     
     def on_frame_received(self, frame: np.ndarray):
         """处理接收到的帧"""
-        self.current_frame = frame
+        # 接收线程发出的帧是独立数组，界面可以直接持有；QImage 需要 C 连续布局
+        self.current_frame = np.ascontiguousarray(frame)
+    
+    def on_raw_frame_received(self, raw):
+        """处理接收到的 16-bit 帧（GPU 显示路径）"""
+        self.current_raw = raw
     
     def on_info_updated(self, info):
         """更新帧信息"""
@@ -843,26 +1307,62 @@ class MainWindow(QMainWindow):
     
     def update_display(self):
         """更新显示"""
+        if self.gl_view is not None:
+            # 只在有新图像时上传纹理，缩放和颜色映射由 GPU 完成
+            if self.current_raw is not None:
+                self.gl_view.set_raw_frame(*self.current_raw)
+                self.current_raw = None
+            elif self.current_frame is not None:
+                self.gl_view.set_rgb_frame(self.current_frame)
+                self.current_frame = None
+            return
+        
         if self.current_frame is not None:
-            # 转换为 QImage
-            height, width, channels = self.current_frame.shape
-            bytes_per_line = channels * width
+            # 先在 NumPy/OpenCV 中缩小到标签尺寸，Qt 只处理显示大小的图像
+            target = self.image_label.size()
+            frame = self.downscale_for_display(self.current_frame, target.width(), target.height())
+            
+            # 转换为 QImage（直接包装 frame 的内存，不复制；fromImage 之前 frame 保持引用）
+            # 单通道灰度图使用 Grayscale8，RGB 图使用 RGB888
+            if frame.ndim == 2:
+                height, width = frame.shape
+                bytes_per_line = width
+                image_format = QImage.Format_Grayscale8
+            else:
+                height, width, channels = frame.shape
+                bytes_per_line = channels * width
+                image_format = QImage.Format_RGB888
             
             qimage = QImage(
-                self.current_frame.data,
+                frame.data,
                 width, height,
                 bytes_per_line,
-                QImage.Format_RGB888
+                image_format
             )
             
             # 显示图像
             pixmap = QPixmap.fromImage(qimage)
-            scaled_pixmap = pixmap.scaled(
-                self.image_label.size(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            self.image_label.setPixmap(scaled_pixmap)
+            if width < target.width() and height < target.height():
+                # 标签比原图大时才交给 Qt 放大
+                pixmap = pixmap.scaled(target, Qt.KeepAspectRatio, Qt.FastTransformation)
+            self.image_label.setPixmap(pixmap)
+    
+    @staticmethod
+    def downscale_for_display(frame: np.ndarray, target_width: int, target_height: int) -> np.ndarray:
+        """按保持宽高比的方式把帧缩小到不超过目标尺寸，返回 C 连续数组"""
+        height, width = frame.shape[:2]
+        scale = min(target_width / width, target_height / height)
+        if scale >= 1.0 or target_width <= 0 or target_height <= 0:
+            return frame
+        
+        if cv2 is not None:
+            # 区域插值：缩小时质量好且速度快
+            size = (max(1, int(width * scale)), max(1, int(height * scale)))
+            return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        
+        # 无 OpenCV 时按整数步长抽样
+        step = int(np.ceil(1.0 / scale))
+        return np.ascontiguousarray(frame[::step, ::step])
     
     def closeEvent(self, event):
         """窗口关闭事件"""
@@ -874,6 +1374,17 @@ class MainWindow(QMainWindow):
 
 def main():
     """主程序入口"""
+    # --gpu：使用 OpenGL 着色器显示（需要 OpenGL 3.3）
+    use_gpu = "--gpu" in sys.argv
+    if use_gpu and QOpenGLWidget is None:
+        print("⚠️  当前 PySide6 不包含 OpenGL 模块，使用 CPU 显示")
+        use_gpu = False
+    if use_gpu:
+        surface_format = QSurfaceFormat()
+        surface_format.setVersion(3, 3)
+        surface_format.setProfile(QSurfaceFormat.CoreProfile)
+        QSurfaceFormat.setDefaultFormat(surface_format)
+    
     app = QApplication(sys.argv)
     
     # 设置应用程序信息
@@ -887,7 +1398,7 @@ def main():
     print()
     
     # 创建并显示主窗口
-    window = MainWindow()
+    window = MainWindow(use_gpu=use_gpu)
     window.show()
     
     # 运行应用程序
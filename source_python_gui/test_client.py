@@ -6,7 +6,7 @@ V4L2 USB RAW Image Receiver - 简化测试客户端
 不依赖 GUI，纯命令行测试 C 库接口。
 
 Usage:
-    python3 test_client.py [server_ip] [port]
+    python3 test_client.py [server_ip] [port] [save_path] [--[no-]convert] [--io-uring]
 
 Author: Development Team
 Date: 2025-06-24
@@ -15,20 +15,59 @@ Version: 2.0.0
 
 import sys
 import os
-import time
+import argparse
 import ctypes
+import logging
+import threading
+from pathlib import Path
 from ctypes import POINTER, Structure, c_char_p, c_int, c_uint32, c_void_p, c_bool
-from typing import Optional
+from typing import Callable, Optional
 
 # ========================== 常量定义 ==========================
 
 DEFAULT_SERVER_IP = "172.32.0.93"
 DEFAULT_PORT = 8888
+FRAME_HEADER_SIZE = 40  # 帧头在线上的字节数（C 端 sizeof(struct frame_header)）
+
+# 日志级别（设为 logging.WARNING 可只输出错误）
+LOG_LEVEL = logging.INFO
+log = logging.getLogger("v4l2_client")
+
+# 根据平台选择库文件
+if sys.platform == "win32":
+    LIB_NAME = "libv4l2_usb_pc.dll"
+elif sys.platform == "darwin":
+    LIB_NAME = "libv4l2_usb_pc.dylib"
+else:
+    LIB_NAME = "libv4l2_usb_pc.so"
+
+# 库文件查找路径（导入时构建一次）
+_HERE = Path(__file__).resolve().parent
+_LIB_CANDIDATES = (
+    _HERE / LIB_NAME,
+    _HERE.parent / "source_all_platform" / "build_native" / "dist" / "linux_x86_64" / "lib" / LIB_NAME,
+    _HERE.parent / "source_all_platform" / "lib" / LIB_NAME,
+    Path(LIB_NAME)  # 当前目录
+)
+
+# 加载时立即解析全部符号，之后的函数查找不再付出延迟绑定开销（Windows 上忽略）
+_LIB_MODE = ctypes.RTLD_LOCAL | getattr(os, "RTLD_NOW", 0)
 
 # ========================== C 库接口定义 ==========================
 
+def _open_lib():
+    """依次直接 dlopen 候选路径，返回 (句柄, 路径)；缺失的文件由 OSError 跳过，不再先 stat 再加载"""
+    errors = []
+    for lib_path in _LIB_CANDIDATES:
+        try:
+            return ctypes.CDLL(str(lib_path), mode=_LIB_MODE), lib_path
+        except OSError as e:
+            errors.append(str(e))
+    raise FileNotFoundError(f"找不到 C 库文件: {LIB_NAME}\n" + "\n".join(errors))
+
 class FrameHeader(Structure):
-    """帧头结构体（对应 C 中的 frame_header）"""
+    """帧头结构体（对应 C 中的 frame_header，线上格式，紧凑排列）"""
+    _pack_ = 1  # 与 C 端 __attribute__((packed)) 一致，布局不随编译器对齐规则变化
     _fields_ = [
         ("magic", c_uint32),
         ("frame_id", c_uint32),
@@ -40,15 +79,28 @@ class FrameHeader(Structure):
         ("reserved", c_uint32 * 2)
     ]
 
-class Stats(Structure):
-    """统计信息结构体（对应 C 中的 stats）"""
-    _fields_ = [
-        ("frames_received", c_uint32),
-        ("bytes_received", c_uint32),
-        ("start_time", ctypes.c_uint64),
-        ("last_frame_time", ctypes.c_uint64),
-        ("avg_fps", ctypes.c_double)
-    ]
+assert ctypes.sizeof(FrameHeader) == FRAME_HEADER_SIZE
+
+# client_config.flags 位定义（对应 C 中的 CONFIG_*）
+CONFIG_ENABLE_SAVE = 1 << 0
+CONFIG_ENABLE_CONVERSION = 1 << 1
+CONFIG_USE_IO_URING = 1 << 2
+
+def _flag_property(bit: int, doc: str) -> property:
+    """把 flags 中的一位暴露为可读写的布尔属性"""
+    def getter(self) -> bool:
+        return bool(self.flags & bit)
+    
+    def setter(self, value):
+        if value:
+            self.flags |= bit
+        else:
+            self.flags &= ~bit
+    
+    return property(getter, setter, doc=doc)
+
+# 逐帧数据回调（对应 C 中的 frame_cb_t）：帧头、原始负载地址、负载字节数
+FrameCallback = ctypes.CFUNCTYPE(None, POINTER(FrameHeader), c_void_p, ctypes.c_size_t)
 
 class ClientConfig(Structure):
     """客户端配置结构体（对应 C 中的 client_config）"""
@@ -56,211 +108,317 @@ class ClientConfig(Structure):
         ("server_ip", c_char_p),
         ("port", c_int),
         ("output_dir", c_char_p),
-        ("enable_conversion", c_int),
-        ("save_interval", c_int),
-        ("enable_save", c_int)
+        ("flags", c_uint32),
+        ("save_interval", ctypes.c_uint16),
+        ("_reserved", ctypes.c_uint16),
+        ("on_frame", FrameCallback)
     ]
+    
+    enable_save = _flag_property(CONFIG_ENABLE_SAVE, "是否启用文件保存")
+    enable_conversion = _flag_property(CONFIG_ENABLE_CONVERSION, "是否启用SBGGR10转换")
+    use_io_uring = _flag_property(CONFIG_USE_IO_URING, "是否使用io_uring接收")
+
+# ClientConfig 预分配池：一次分配连续的 N 个结构体，按索引借出/归还，
+# 反复连接时不再逐次创建 Structure 对象
+CFG_POOL_SIZE = 64
+_CFG_POOL = (ClientConfig * CFG_POOL_SIZE)()
+_CFG_FREE = list(range(CFG_POOL_SIZE))
+
+def _acquire_config():
+    """从池中借出一个清零的 ClientConfig，返回 (索引, 结构体)"""
+    if not _CFG_FREE:
+        raise RuntimeError("ClientConfig 池已耗尽")
+    idx = _CFG_FREE.pop()
+    config = _CFG_POOL[idx]
+    ctypes.memset(ctypes.addressof(config), 0, ctypes.sizeof(ClientConfig))
+    return idx, config
+
+def _release_config(idx: int):
+    """将 ClientConfig 归还到池中"""
+    _CFG_FREE.append(idx)
+
+def _configure(lib: ctypes.CDLL):
+    """设置 C 函数原型（每次加载库只执行一次）"""
+    # init_network()
+    lib.init_network.argtypes = []
+    lib.init_network.restype = c_int
+    
+    # cleanup_network()
+    lib.cleanup_network.argtypes = []
+    lib.cleanup_network.restype = None
+    
+    # connect_to_server(ip, port)
+    lib.connect_to_server.argtypes = [c_char_p, c_int]
+    lib.connect_to_server.restype = c_int  # socket_t
+    
+    # create_output_dir(dir)
+    lib.create_output_dir.argtypes = [c_char_p]
+    lib.create_output_dir.restype = c_int
+    
+    # cancel_receive(sock)
+    lib.cancel_receive.argtypes = [c_int]
+    lib.cancel_receive.restype = None
+    
+    # has_io_uring()
+    lib.has_io_uring.argtypes = []
+    lib.has_io_uring.restype = c_int
+    
+    # receive_loop(sock, config)
+    lib.receive_loop.argtypes = [c_int, POINTER(ClientConfig)]
+    lib.receive_loop.restype = c_int
+    
+    # init_memory_pool()
+    lib.init_memory_pool.argtypes = []
+    lib.init_memory_pool.restype = None
+    
+    # cleanup_memory_pool()
+    lib.cleanup_memory_pool.argtypes = []
+    lib.cleanup_memory_pool.restype = None
+    
+    # pool_enable_hugepages(slot_bytes)
+    lib.pool_enable_hugepages.argtypes = [ctypes.c_size_t]
+    lib.pool_enable_hugepages.restype = c_int
+    
+    log.info("✅ 函数原型设置完成")
+
+_LIB = None
+
+def _get_lib() -> ctypes.CDLL:
+    """加载 C 库并设置函数原型，进程内所有客户端共用同一个句柄"""
+    global _LIB
+    if _LIB is not None:
+        return _LIB
+    
+    lib, lib_path = _open_lib()
+    log.info("✅ 成功加载 C 库: %s", lib_path)
+    _configure(lib)
+    _LIB = lib
+    return _LIB
 
 class V4L2TestClient:
     """V4L2 测试客户端"""
     
-    def __init__(self):
+    def __init__(self, on_frame: Optional[Callable[[FrameHeader, int, int], None]] = None):
+        """
+        Args:
+            on_frame: 可选的逐帧回调 (帧头, 负载地址, 负载字节数)，在接收线程中调用，
+                      负载地址仅在回调返回前有效
+        """
         self.lib = None
         self.config = None
+        self._cfg_idx = None
         self.sock_fd = None
+        # 由客户端持有的字符串缓冲区，ClientConfig 中的指针始终指向它们
+        self._ip_buf = ctypes.create_string_buffer(64)
+        self._out_buf = ctypes.create_string_buffer(4096)
+        # 回调对象保存在实例上，防止被回收后 C 侧调用悬空指针；未指定时为空指针
+        self._on_frame = on_frame
+        self._frame_cb = FrameCallback(self._dispatch_frame) if on_frame else FrameCallback()
         self.load_library()
     
+    def _dispatch_frame(self, header, payload, size):
+        """C 接收循环每收完一帧调用一次"""
+        self._on_frame(header.contents, payload, size)
+    
     def load_library(self):
         """加载 C 动态库"""
         try:
-            # 根据平台选择库文件
-            if sys.platform == "win32":
-                lib_name = "libv4l2_usb_pc.dll"
-            elif sys.platform == "darwin":
-                lib_name = "libv4l2_usb_pc.dylib"
-            else:
-                lib_name = "libv4l2_usb_pc.so"
-            
-            # 查找库文件路径
-            lib_paths = [
-                os.path.join(os.path.dirname(__file__), lib_name),
-                os.path.join(os.path.dirname(__file__), "..", "source_all_platform", "build_native", "dist", f"linux_x86_64", "lib", lib_name),
-                os.path.join(os.path.dirname(__file__), "..", "source_all_platform", "lib", lib_name),
-                lib_name  # 系统路径
-            ]
-            
-            for lib_path in lib_paths:
-                if os.path.exists(lib_path):
-                    self.lib = ctypes.CDLL(lib_path)
-                    print(f"✅ 成功加载 C 库: {lib_path}")
-                    break
-            
-            if not self.lib:
-                raise FileNotFoundError(f"找不到 C 库文件: {lib_name}")
-            
-            # 定义函数原型
-            self.setup_function_prototypes()
-            
+            self.lib = _get_lib()
         except Exception as e:
-            print(f"❌ 加载 C 库失败: {e}")
+            log.error("❌ 加载 C 库失败: %s", e)
             sys.exit(1)
     
-    def setup_function_prototypes(self):
-        """设置 C 函数原型"""
-        # init_network()
-        self.lib.init_network.argtypes = []
-        self.lib.init_network.restype = c_int
-        
-        # cleanup_network()
-        self.lib.cleanup_network.argtypes = []
-        self.lib.cleanup_network.restype = None
-        
-        # connect_to_server(ip, port)
-        self.lib.connect_to_server.argtypes = [c_char_p, c_int]
-        self.lib.connect_to_server.restype = c_int  # socket_t
-        
-        # create_output_dir(dir)
-        self.lib.create_output_dir.argtypes = [c_char_p]
-        self.lib.create_output_dir.restype = c_int
-        
-        # receive_loop(sock, config)
-        self.lib.receive_loop.argtypes = [c_int, POINTER(ClientConfig)]
-        self.lib.receive_loop.restype = c_int
-        
-        # init_memory_pool()
-        self.lib.init_memory_pool.argtypes = []
-        self.lib.init_memory_pool.restype = None
-        
-        # cleanup_memory_pool()
-        self.lib.cleanup_memory_pool.argtypes = []
-        self.lib.cleanup_memory_pool.restype = None
-        
-        print("✅ 函数原型设置完成")
+    @staticmethod
+    def _fill_buffer(buf, text: str) -> c_char_p:
+        """把字符串写入预分配缓冲区（含结尾的 NUL），返回指向该缓冲区的 c_char_p"""
+        data = text.encode('utf-8')
+        if len(data) >= len(buf):
+            raise ValueError(f"字符串过长: {text}")
+        ctypes.memmove(buf, data, len(data))
+        buf[len(data)] = b'\0'
+        return ctypes.cast(buf, c_char_p)
     
-    def test_connection(self, server_ip: str, port: int, save_path: Optional[str] = None):
-        """测试连接"""
-        print(f"\n🔗 测试连接到 {server_ip}:{port}")
+    def test_connection(self, server_ip: str, port: int, save_path: Optional[str] = None,
+                        convert: Optional[bool] = None, use_io_uring: bool = False):
+        """测试连接
+        
+        Args:
+            convert: 是否启用 SBGGR10 解包；默认仅在保存文件时启用，
+                     仅内存模式下没有读取方，解包结果会被直接丢弃
+            use_io_uring: 是否使用 io_uring 接收（默认关闭）；内核不支持所需操作码时回退到 recv
+        """
+        log.info("🔗 测试连接到 %s:%d", server_ip, port)
         
         # 初始化网络
-        print("📡 初始化网络...")
+        log.info("📡 初始化网络...")
         if self.lib.init_network() != 0:
-            print("❌ 网络初始化失败")
+            log.error("❌ 网络初始化失败")
             return False
-        print("✅ 网络初始化成功")
+        log.info("✅ 网络初始化成功")
         
         # 初始化内存池
-        print("💾 初始化内存池...")
+        log.info("💾 初始化内存池...")
         self.lib.init_memory_pool()
-        print("✅ 内存池初始化成功")
+        # 槽大小保持默认，仅迁移到透明大页（不支持时保留原内存池）
+        if self.lib.pool_enable_hugepages(0) == 0:
+            log.info("✅ 内存池初始化成功（透明大页）")
+        else:
+            log.info("✅ 内存池初始化成功")
         
-        # 配置客户端
-        self.config = ClientConfig()
-        self.config.server_ip = server_ip.encode('utf-8')
+        # 配置客户端（从预分配池中借出，cleanup 时归还）
+        if self._cfg_idx is None:
+            self._cfg_idx, self.config = _acquire_config()
+        self.config.server_ip = self._fill_buffer(self._ip_buf, server_ip)
         self.config.port = port
-        self.config.output_dir = save_path.encode('utf-8') if save_path else None
-        self.config.enable_conversion = 1  # 启用转换
+        self.config.output_dir = self._fill_buffer(self._out_buf, save_path) if save_path else None
+        self.config.enable_conversion = bool(save_path) if convert is None else convert
         self.config.save_interval = 1
         self.config.enable_save = 1 if save_path else 0
+        self.config.on_frame = self._frame_cb
+        # io_uring 需显式开启：当前每次接收仍是一次 io_uring_enter，相比 recv 没有批量收益
+        if use_io_uring and not self.lib.has_io_uring():
+            log.warning("⚠️  内核不支持 io_uring 接收，回退到 recv")
+            use_io_uring = False
+        self.config.use_io_uring = use_io_uring
+        log.info("📥 接收后端: %s", "io_uring" if self.config.use_io_uring else "recv")
         
         # 如果需要保存文件，创建输出目录
         if save_path:
-            print(f"📁 创建输出目录: {save_path}")
-            if self.lib.create_output_dir(save_path.encode('utf-8')) != 0:
-                print(f"❌ 无法创建输出目录: {save_path}")
+            log.info("📁 创建输出目录: %s", save_path)
+            if self.lib.create_output_dir(self.config.output_dir) != 0:
+                log.error("❌ 无法创建输出目录: %s", save_path)
                 return False
-            print("✅ 输出目录创建成功")
+            log.info("✅ 输出目录创建成功")
         
         # 连接到服务器
-        print("🌐 连接到服务器...")
+        log.info("🌐 连接到服务器...")
         self.sock_fd = self.lib.connect_to_server(self.config.server_ip, self.config.port)
         if self.sock_fd < 0:
-            print("❌ 连接服务器失败")
+            log.error("❌ 连接服务器失败")
             return False
         
-        print(f"✅ 成功连接到服务器: {server_ip}:{port}")
-        print(f"📊 Socket FD: {self.sock_fd}")
+        log.info("✅ 成功连接到服务器: %s:%d", server_ip, port)
+        log.info("📊 Socket FD: %d", self.sock_fd)
         
         return True
     
     def run_receive_loop(self):
         """运行接收循环"""
         if not self.lib or not self.config or self.sock_fd is None:
-            print("❌ 客户端未正确初始化")
+            log.error("❌ 客户端未正确初始化")
             return False
         
-        print("\\n🚀 开始接收循环...")
-        print("按 Ctrl+C 停止")
+        log.info("🚀 开始接收循环...")
+        log.info("按 Ctrl+C 停止")
+        
+        # C 的接收循环在工作线程中运行，主线程保持可响应 Ctrl+C
+        c_int.in_dll(self.lib, "running").value = 1
+        result = []
+        
+        def receive():
+            result.append(self.lib.receive_loop(self.sock_fd, ctypes.byref(self.config)))
+        
+        worker = threading.Thread(target=receive, daemon=True)
         
         try:
-            # 调用 C 的接收循环
-            result = self.lib.receive_loop(self.sock_fd, ctypes.byref(self.config))
+            worker.start()
+            while worker.is_alive():
+                worker.join(0.1)
             
-            if result == 0:
-                print("\\n✅ 接收循环正常结束")
+            if result and result[0] == 0:
+                log.info("✅ 接收循环正常结束")
                 return True
             else:
-                print(f"\\n❌ 接收循环异常结束，返回值: {result}")
+                log.error("❌ 接收循环异常结束，返回值: %s", result[0] if result else None)
                 return False
                 
         except KeyboardInterrupt:
-            print("\\n⏹️  用户中断")
+            log.info("⏹️  用户中断")
+            self.stop()
+            worker.join()
             return True
         except Exception as e:
-            print(f"\\n❌ 接收循环异常: {e}")
+            log.error("❌ 接收循环异常: %s", e)
             return False
     
+    def stop(self):
+        """停止接收：清除运行标志并唤醒阻塞在 recv() 中的接收线程"""
+        if self.lib and self.sock_fd is not None:
+            self.lib.cancel_receive(self.sock_fd)
+    
     def cleanup(self):
         """清理资源"""
-        print("\\n🧹 清理资源...")
+        log.info("🧹 清理资源...")
         
         if self.lib:
             # 清理内存池
             self.lib.cleanup_memory_pool()
-            print("✅ 内存池已清理")
+            log.info("✅ 内存池已清理")
             
             # 清理网络
             self.lib.cleanup_network()
-            print("✅ 网络已清理")
+            log.info("✅ 网络已清理")
         
+        if self._cfg_idx is not None:
+            _release_config(self._cfg_idx)
+            self._cfg_idx = None
         self.config = None
         self.sock_fd = None
-        print("✅ 资源清理完成")
+        log.info("✅ 资源清理完成")
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="V4L2 USB RAW Image Receiver - 测试客户端")
+    parser.add_argument("server_ip", nargs="?", default=DEFAULT_SERVER_IP,
+                        help=f"服务器 IP (默认: {DEFAULT_SERVER_IP})")
+    parser.add_argument("port", nargs="?", type=int, default=DEFAULT_PORT,
+                        help=f"服务器端口 (默认: {DEFAULT_PORT})")
+    parser.add_argument("save_path", nargs="?", type=Path, default=None,
+                        help="帧保存目录 (默认: 仅内存模式)")
+    parser.add_argument("--convert", action=argparse.BooleanOptionalAction, default=None,
+                        help="启用/关闭 SBGGR10 解包 (默认: 仅保存文件时启用)")
+    parser.add_argument("--io-uring", action="store_true",
+                        help="使用 io_uring 接收 (默认: recv；内核不支持时自动回退)")
+    return parser.parse_args(argv)
 
 def main():
     """主程序入口"""
-    print("V4L2 USB RAW Image Receiver - 测试客户端 v2.0.0")
-    print("=" * 60)
+    args = parse_args()
+    save_path = str(args.save_path) if args.save_path else None
+    convert = bool(save_path) if args.convert is None else args.convert
+    
+    logging.basicConfig(level=LOG_LEVEL, format="%(message)s")
     
-    # 解析命令行参数
-    server_ip = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SERVER_IP
-    port = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PORT
-    save_path = sys.argv[3] if len(sys.argv) > 3 else None
+    log.info("V4L2 USB RAW Image Receiver - 测试客户端 v2.0.0")
+    log.info("=" * 60)
     
-    print(f"📋 配置:")
-    print(f"   服务器: {server_ip}:{port}")
-    print(f"   保存路径: {save_path or '仅内存模式'}")
+    log.info("📋 配置:")
+    log.info("   服务器: %s:%d", args.server_ip, args.port)
+    log.info("   保存路径: %s", save_path or "仅内存模式")
+    log.info("   SBGGR10 解包: %s", "启用" if convert else "关闭")
     
     # 创建客户端
     client = V4L2TestClient()
     
     try:
         # 测试连接
-        if not client.test_connection(server_ip, port, save_path):
-            print("❌ 连接测试失败")
+        if not client.test_connection(args.server_ip, args.port, save_path,
+                                      convert, args.io_uring):
+            log.error("❌ 连接测试失败")
             return 1
         
         # 运行接收循环
         client.run_receive_loop()
         
     except Exception as e:
-        print(f"❌ 程序异常: {e}")
+        log.error("❌ 程序异常: %s", e)
         return 1
     
     finally:
         # 清理资源
         client.cleanup()
     
-    print("\\n🎉 程序结束")
+    log.info("🎉 程序结束")
     return 0
 
 if __name__ == "__main__":